@@ -5,6 +5,7 @@ import mdx from "@astrojs/mdx";
 import lenis from "astro-lenis";
 import icon from "astro-icon";
 import partytown from '@astrojs/partytown';
+import optimizeModels from './integrations/optimize-models.mjs';
 // https://astro.build/config
 export default defineConfig({
   site: 'https://www.sp-webcreat.pro',
@@ -23,6 +24,19 @@ export default defineConfig({
         forward: ['dataLayer.push'],
       },
     }),
+    // GLB 最適化（meshopt + KTX2 + LOD）とデコーダーのセルフホスト
+    // バジェットは integrations/model-budgets.json（LOD0 の実測値 + ヘッドルーム）。超えたらビルド失敗
+    // LOD は画質ティア low / medium で差し替えるモデル（鳥・結晶）のみ生成する
+    optimizeModels({
+      lods: {
+        'mechanical-bird': [0.5, 0.25],
+        'crystal-ai-cube': [0.5, 0.25],
+        'crystal-code-tablet': [0.5, 0.25],
+        'crystal-database': [0.5, 0.25],
+        'crystal-gear-nature': [0.5, 0.25],
+        'crystal-hologram-disc': [0.5, 0.25],
+      },
+    }),
   ],
   vite: {
     plugins: [],
@@ -39,9 +53,22 @@ export default defineConfig({
         },
       },
     },
-  },
-  build: {
-    chunkSizeWarningLimit: 1000, // 1000kBに設定
+    build: {
+      // 3D スタックをライブラリ単位のチャンクに分割
+      // （ThreeModel/Scene.tsx の動的 import 以降でのみ読み込まれ、初期表示・ブログには含まれない）
+      rollupOptions: {
+        output: {
+          manualChunks(id) {
+            if (!id.includes('node_modules')) return;
+            if (/[\\/]node_modules[\\/]three[\\/]/.test(id)) return 'three';
+            if (/[\\/]node_modules[\\/](postprocessing|@react-three[\\/]postprocessing)[\\/]/.test(id)) return 'postprocessing';
+            if (/[\\/]node_modules[\\/](@react-three[\\/](fiber|drei)|three-stdlib)[\\/]/.test(id)) return 'r3f';
+          },
+        },
+      },
+      // three 本体（最大のチャンク）が収まる値。これを超えたら分割を見直す
+      chunkSizeWarningLimit: 700,
+    },
   },
   script: {
     external: ['https://www.googletagmanager.com/gtm.js'],
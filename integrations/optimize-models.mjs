@@ -0,0 +1,531 @@
+// GLB 最適化インテグレーション
+// - ビルド時に public/models/*.glb を gltfpack で最適化（meshopt 圧縮 + KTX2 テクスチャ + LOD）
+//   gltfpack は Draco 入力を読めないため、Draco メッシュは three 同梱のデコーダーで先に展開する
+//   gltfpack が失敗したらビルドを失敗させる（元ファイルのまま配信しない）
+// - Draco / Basis デコーダーを dist/decoders/ にセルフホスト
+// - 実行時の URL は `virtual:model-manifest` から参照（dev では元ファイルをそのまま返す）
+// - アセットごとのサイズ・三角形数バジェット（実測値 + ヘッドルーム）を超えたらビルドを失敗させる
+//   `MODEL_BUDGETS=write npm run build` で LOD0 の実測値からバジェットファイルを書き直す
+import { createHash } from 'node:crypto';
+import { execFile } from 'node:child_process';
+import { createRequire } from 'node:module';
+import { promisify } from 'node:util';
+import fs from 'node:fs/promises';
+import { createReadStream } from 'node:fs';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+
+const execFileAsync = promisify(execFile);
+const require = createRequire(import.meta.url);
+
+const VIRTUAL_ID = 'virtual:model-manifest';
+const RESOLVED_VIRTUAL_ID = '\0' + VIRTUAL_ID;
+
+const MODELS_DIR = 'models';
+const DECODER_BASE = '/decoders/';
+
+// three 同梱のデコーダー（dev ではミドルウェアで配信、build では dist にコピー）
+const DECODER_SOURCES = {
+  draco: {
+    dir: 'three/examples/jsm/libs/draco/gltf/',
+    files: ['draco_decoder.js', 'draco_decoder.wasm', 'draco_wasm_wrapper.js'],
+  },
+  basis: {
+    dir: 'three/examples/jsm/libs/basis/',
+    files: ['basis_transcoder.js', 'basis_transcoder.wasm'],
+  },
+};
+
+// 出力の形式が変わったら上げる（古いキャッシュを使わせない）
+const CACHE_VERSION = 3;
+
+// バジェット書き出し時のヘッドルーム（実測値に対する余裕）
+const BYTES_HEADROOM = 1.1;
+const TRIANGLES_HEADROOM = 1.02;
+
+/**
+ * @typedef {{ maxBytes?: number, maxTriangles?: number }} ModelBudget
+ * @typedef {{ headroom: { bytes: number, triangles: number }, models: Record<string, ModelBudget> }} BudgetFile
+ * @typedef {{
+ *   lods?: Record<string, number[]>,
+ *   textures?: 'ktx2' | 'keep',
+ *   budgetsFile?: string,
+ * }} OptimizeModelsOptions
+ */
+
+/** @param {OptimizeModelsOptions} [options] */
+export default function optimizeModels(options = {}) {
+  const lods = options.lods ?? {};
+  const textures = options.textures ?? 'ktx2';
+  const budgetsFile = options.budgetsFile ?? 'integrations/model-budgets.json';
+  const writeBudgets = process.env.MODEL_BUDGETS === 'write';
+
+  let root = '';
+  let publicDir = '';
+  let cacheDir = '';
+  /** @type {ReturnType<typeof emptyManifest> | null} */
+  let buildManifest = null;
+  /** @type {{ source: string, files: [string, string][] }[]} */
+  let emitted = [];
+
+  return {
+    name: 'optimize-models',
+    hooks: {
+      'astro:config:setup': ({ config, updateConfig }) => {
+        root = fileURLToPath(config.root);
+        publicDir = fileURLToPath(config.publicDir);
+        cacheDir = path.join(root, 'node_modules', '.cache', 'optimize-models');
+
+        updateConfig({
+          vite: {
+            plugins: [{
+              name: 'optimize-models:manifest',
+              resolveId(id) {
+                if (id === VIRTUAL_ID) return RESOLVED_VIRTUAL_ID;
+              },
+              async load(id) {
+                if (id !== RESOLVED_VIRTUAL_ID) return;
+                const manifest = buildManifest ?? await devManifest(publicDir);
+                return `export default ${JSON.stringify(manifest)};`;
+              },
+              configureServer(server) {
+                // dev: /decoders/{draco,basis}/* を node_modules の three から配信
+                server.middlewares.use(DECODER_BASE, (req, res, next) => {
+                  const [kind, ...rest] = (req.url ?? '').split('?')[0].split('/').filter(Boolean);
+                  if (!(kind in DECODER_SOURCES) || !DECODER_SOURCES[kind].files.includes(rest.join('/'))) return next();
+                  const file = path.join(resolveDecoderDir(kind), rest[0]);
+                  fs.stat(file).then(() => {
+                    if (file.endsWith('.wasm')) res.setHeader('Content-Type', 'application/wasm');
+                    else if (file.endsWith('.js')) res.setHeader('Content-Type', 'text/javascript');
+                    createReadStream(file).pipe(res);
+                  }, () => next());
+                });
+              },
+            }],
+          },
+        });
+      },
+
+      'astro:build:start': async ({ logger }) => {
+        const sources = await listModels(publicDir);
+        const manifest = emptyManifest();
+        const violations = [];
+        const unbudgeted = [];
+        /** @type {Record<string, ModelBudget>} */
+        const measured = {};
+        const budgets = await readBudgets(path.join(root, budgetsFile));
+        emitted = [];
+
+        await fs.mkdir(cacheDir, { recursive: true });
+
+        for (const file of sources) {
+          const name = path.basename(file, '.glb');
+          const sourceUrl = `/${MODELS_DIR}/${file}`;
+          const input = path.join(publicDir, MODELS_DIR, file);
+          const inputBytes = (await fs.stat(input)).size;
+
+          const levels = [];
+          for (const ratio of [1, ...(lods[name] ?? [])]) {
+            const out = await packModel(input, { ratio, textures, cacheDir, logger });
+            const buffer = await fs.readFile(out);
+            const triangles = countTriangles(buffer);
+            // 簡略化が効かなかった LOD は出力しない（modelUrl は最後の LOD にフォールバックする）
+            const prev = levels.at(-1);
+            if (prev && triangles >= prev.triangles) {
+              logger.warn(`${file}: LOD ratio ${ratio} did not reduce triangles (${triangles}), skipped`);
+              continue;
+            }
+            const lod = levels.length;
+            const hash = createHash('sha256').update(buffer).digest('hex').slice(0, 8);
+            const fileName = lod === 0 ? `${name}.${hash}.glb` : `${name}.lod${lod}.${hash}.glb`;
+            levels.push({
+              url: `/${MODELS_DIR}/${fileName}`,
+              bytes: buffer.length,
+              triangles,
+              cached: out,
+              fileName,
+            });
+          }
+
+          const [lod0] = levels;
+          measured[name] = {
+            maxBytes: Math.ceil(lod0.bytes * BYTES_HEADROOM),
+            maxTriangles: Math.ceil(lod0.triangles * TRIANGLES_HEADROOM),
+          };
+          const budget = budgets.models[name] ?? {};
+          if (budget.maxBytes === undefined || budget.maxTriangles === undefined) unbudgeted.push(name);
+          if (budget.maxBytes !== undefined && lod0.bytes > budget.maxBytes) {
+            violations.push(`${name}: ${formatBytes(lod0.bytes)} > budget ${formatBytes(budget.maxBytes)}`);
+          }
+          if (budget.maxTriangles !== undefined && lod0.triangles > budget.maxTriangles) {
+            violations.push(`${name}: ${lod0.triangles} tris > budget ${budget.maxTriangles}`);
+          }
+
+          manifest.models[sourceUrl] = {
+            url: lod0.url,
+            lods: levels.map((l) => l.url),
+            bytes: lod0.bytes,
+            triangles: lod0.triangles,
+          };
+          emitted.push({ source: file, files: levels.map((l) => /** @type {[string, string]} */ ([l.cached, l.fileName])) });
+
+          logger.info(
+            `${file}: ${formatBytes(inputBytes)} → ${formatBytes(lod0.bytes)}, ${lod0.triangles} tris`
+            + (levels.length > 1 ? ` (LOD ${levels.slice(1).map((l) => l.triangles).join(' / ')})` : ''),
+          );
+        }
+
+        if (writeBudgets) {
+          /** @type {BudgetFile} */
+          const file = { headroom: { bytes: BYTES_HEADROOM, triangles: TRIANGLES_HEADROOM }, models: measured };
+          await fs.writeFile(path.join(root, budgetsFile), JSON.stringify(file, null, 2) + '\n');
+          logger.info(`wrote measured budgets to ${budgetsFile}`);
+        } else if (violations.length > 0) {
+          throw new Error(`Model budget exceeded:\n  ${violations.join('\n  ')}`);
+        }
+
+        if (!writeBudgets && unbudgeted.length > 0) {
+          logger.warn(`no measured byte/triangle budget for ${unbudgeted.join(', ')} (run MODEL_BUDGETS=write npm run build)`);
+        }
+
+        buildManifest = manifest;
+      },
+
+      'astro:build:done': async ({ dir, logger }) => {
+        if (!buildManifest) return;
+        const outDir = fileURLToPath(dir);
+        const modelsOut = path.join(outDir, MODELS_DIR);
+
+        for (const { source, files } of emitted) {
+          // public/ からコピーされた未最適化の元ファイルは配信しない
+          await fs.rm(path.join(modelsOut, source), { force: true });
+          for (const [cached, fileName] of files) {
+            await fs.copyFile(cached, path.join(modelsOut, fileName));
+          }
+        }
+        await fs.writeFile(
+          path.join(modelsOut, 'manifest.json'),
+          JSON.stringify(buildManifest, null, 2),
+        );
+
+        for (const [kind, { files }] of Object.entries(DECODER_SOURCES)) {
+          const target = path.join(outDir, DECODER_BASE, kind);
+          await fs.mkdir(target, { recursive: true });
+          for (const file of files) {
+            await fs.copyFile(path.join(resolveDecoderDir(kind), file), path.join(target, file));
+          }
+        }
+
+        logger.info(`wrote ${emitted.length} models and decoders to ${path.relative(root, outDir)}`);
+      },
+    },
+  };
+}
+
+function emptyManifest() {
+  return {
+    /** @type {Record<string, { url: string, lods: string[], bytes: number, triangles: number }>} */
+    models: {},
+    decoders: {
+      draco: `${DECODER_BASE}draco/`,
+      basis: `${DECODER_BASE}basis/`,
+    },
+  };
+}
+
+// dev: 最適化せず元ファイルをそのまま参照
+async function devManifest(publicDir) {
+  const manifest = emptyManifest();
+  for (const file of await listModels(publicDir)) {
+    const url = `/${MODELS_DIR}/${file}`;
+    manifest.models[url] = { url, lods: [url], bytes: 0, triangles: 0 };
+  }
+  return manifest;
+}
+
+/** @returns {Promise<BudgetFile>} */
+async function readBudgets(file) {
+  try {
+    return JSON.parse(await fs.readFile(file, 'utf8'));
+  } catch {
+    return { headroom: { bytes: BYTES_HEADROOM, triangles: TRIANGLES_HEADROOM }, models: {} };
+  }
+}
+
+async function listModels(publicDir) {
+  try {
+    const files = await fs.readdir(path.join(publicDir, MODELS_DIR));
+    return files.filter((f) => f.endsWith('.glb')).sort();
+  } catch {
+    return [];
+  }
+}
+
+function resolveDecoderDir(kind) {
+  const { dir, files } = DECODER_SOURCES[kind];
+  return path.dirname(require.resolve(`${dir}${files[0]}`));
+}
+
+// npm 版 gltfpack が KTX2 エンコード（-tc）に対応しているか。最初の -tc 実行で判定する（null = 未判定）
+/** @type {boolean | null} */
+let ktx2Supported = null;
+
+// gltfpack を実行し、キャッシュ済み出力のパスを返す（失敗したら例外）
+async function packModel(input, { ratio, textures, cacheDir, logger }) {
+  const source = await fs.readFile(input);
+  const name = path.basename(input, '.glb');
+
+  /** @param {boolean} ktx2 */
+  const argsFor = (ktx2) => [
+    '-cc',          // meshopt 圧縮（高圧縮モード）
+    '-kn', '-km',   // ノード名・マテリアル名を保持（Mesh_0 / Mat_Cyan_Glow 等をコードから参照）
+    '-ke',          // extras を保持
+    ...(ktx2 ? ['-tc'] : []),
+    ...(ratio < 1 ? ['-si', String(ratio)] : []),
+  ];
+  // キャッシュキーは実際に使った引数から作る（KTX2 非対応で -tc なしになった出力を -tc のキーで保存しない）
+  const outFor = (args) => {
+    const key = createHash('sha256')
+      .update(source)
+      .update(JSON.stringify({ args, version: CACHE_VERSION, gltfpack: require('gltfpack/package.json').version }))
+      .digest('hex')
+      .slice(0, 16);
+    return path.join(cacheDir, `${name}-${key}.glb`);
+  };
+
+  const wantKtx2 = textures === 'ktx2' && ktx2Supported !== false;
+  const args = argsFor(wantKtx2);
+  const out = outFor(args);
+  try {
+    await fs.access(out);
+    return out;
+  } catch { /* cache miss */ }
+
+  // Draco メッシュは展開してから渡す（展開結果もキャッシュ）
+  let packInput = input;
+  if (readGlbJson(source).extensionsUsed?.includes('KHR_draco_mesh_compression')) {
+    const sourceKey = createHash('sha256').update(source).update(String(CACHE_VERSION)).digest('hex').slice(0, 16);
+    packInput = path.join(cacheDir, `${name}-${sourceKey}.decoded.glb`);
+    try {
+      await fs.access(packInput);
+    } catch {
+      await decodeDraco(input, packInput);
+    }
+  }
+
+  try {
+    await runGltfpack(packInput, out, args);
+    if (wantKtx2) ktx2Supported = true;
+    return out;
+  } catch (e) {
+    // -tc で失敗し、まだ対応が確認できていなければ -tc なしで再実行して判定する
+    if (!wantKtx2 || ktx2Supported === true) throw packError(input, e);
+    const fallbackArgs = argsFor(false);
+    const fallbackOut = outFor(fallbackArgs);
+    try {
+      await runGltfpack(packInput, fallbackOut, fallbackArgs);
+    } catch (e2) {
+      throw packError(input, e2);
+    }
+    ktx2Supported = false;
+    logger.warn(`gltfpack cannot encode KTX2 here, keeping original textures for all models (${firstLine(e)})`);
+    return fallbackOut;
+  }
+}
+
+// 一時ファイルに書いてから確定する（途中で失敗した出力をキャッシュに残さない）
+async function runGltfpack(input, out, args) {
+  const tmp = `${out}.tmp.glb`;
+  const cli = path.join(path.dirname(require.resolve('gltfpack')), 'cli.js');
+  try {
+    await execFileAsync(process.execPath, [cli, '-i', input, '-o', tmp, ...args]);
+  } catch (e) {
+    await fs.rm(tmp, { force: true });
+    throw e;
+  }
+  await fs.rename(tmp, out);
+}
+
+function packError(input, e) {
+  return new Error(`gltfpack failed for ${path.basename(input)}: ${firstLine(e)}`);
+}
+
+// --- Draco 展開 ---
+// three 同梱の Draco デコーダー（asm.js 版）で KHR_draco_mesh_compression のプリミティブを展開し、
+// 非圧縮のアクセサとして BIN チャンク末尾に追記する（圧縮データの bufferView は参照されなくなり、gltfpack が捨てる）
+
+const GLB_MAGIC = 0x46546c67;
+const CHUNK_JSON = 0x4e4f534a;
+const CHUNK_BIN = 0x004e4942;
+
+/** glTF componentType → [TypedArray, Draco のデータ型名] */
+const COMPONENT_TYPES = {
+  5120: [Int8Array, 'DT_INT8'],
+  5121: [Uint8Array, 'DT_UINT8'],
+  5122: [Int16Array, 'DT_INT16'],
+  5123: [Uint16Array, 'DT_UINT16'],
+  5125: [Uint32Array, 'DT_UINT32'],
+  5126: [Float32Array, 'DT_FLOAT32'],
+};
+
+/** @type {Promise<any> | null} */
+let dracoModule = null;
+
+// three の package.json は "type": "module" のため require できない。CommonJS として評価する
+function loadDracoModule() {
+  dracoModule ??= (async () => {
+    const file = path.join(resolveDecoderDir('draco'), 'draco_decoder.js');
+    const code = await fs.readFile(file, 'utf8');
+    const module = { exports: {} };
+    const factory = new Function(
+      'module', 'exports', 'require', '__filename', '__dirname',
+      `${code}\nreturn typeof DracoDecoderModule !== 'undefined' ? DracoDecoderModule : module.exports;`,
+    )(module, module.exports, require, file, path.dirname(file));
+    // モジュール自体が thenable のため、そのまま resolve せずオブジェクトで包む
+    const { draco } = await new Promise((resolve) => {
+      factory({ onModuleLoaded: (draco) => resolve({ draco }) });
+    });
+    return draco;
+  })();
+  return dracoModule;
+}
+
+function decodeDracoPrimitive(draco, data, attributes, accessors, indices) {
+  const decoder = new draco.Decoder();
+  const mesh = new draco.Mesh();
+  try {
+    const status = decoder.DecodeArrayToMesh(data, data.byteLength, mesh);
+    if (!status.ok() || mesh.ptr === 0) throw new Error(`Draco decode failed: ${status.error_msg()}`);
+
+    /** @type {Record<string, ArrayBufferView>} */
+    const decoded = {};
+    const numPoints = mesh.num_points();
+    for (const [semantic, uniqueId] of Object.entries(attributes)) {
+      const accessor = accessors[semantic];
+      const [ArrayType, dataType] = COMPONENT_TYPES[accessor.componentType];
+      const attribute = decoder.GetAttributeByUniqueId(mesh, uniqueId);
+      const length = numPoints * attribute.num_components();
+      const byteLength = length * ArrayType.BYTES_PER_ELEMENT;
+      const ptr = draco._malloc(byteLength);
+      decoder.GetAttributeDataArrayForAllPoints(mesh, attribute, draco[dataType], byteLength, ptr);
+      decoded[semantic] = new ArrayType(draco.HEAPF32.buffer, ptr, length).slice();
+      draco._free(ptr);
+    }
+
+    let index = null;
+    if (indices) {
+      const length = mesh.num_faces() * 3;
+      const ptr = draco._malloc(length * 4);
+      decoder.GetTrianglesUInt32Array(mesh, length * 4, ptr);
+      const [ArrayType] = COMPONENT_TYPES[indices.componentType];
+      index = ArrayType.from(new Uint32Array(draco.HEAPF32.buffer, ptr, length));
+      draco._free(ptr);
+    }
+    return { attributes: decoded, index, count: numPoints };
+  } finally {
+    draco.destroy(mesh);
+    draco.destroy(decoder);
+  }
+}
+
+// KHR_draco_mesh_compression を展開した GLB を書き出す
+async function decodeDraco(input, out) {
+  const draco = await loadDracoModule();
+  const source = await fs.readFile(input);
+  const json = readGlbJson(source);
+  const jsonLength = source.readUInt32LE(12);
+  const binStart = 20 + jsonLength + 8;
+  const bin = source.subarray(binStart, binStart + source.readUInt32LE(20 + jsonLength));
+
+  const chunks = [bin];
+  let binLength = bin.length;
+  const append = (view) => {
+    const pad = (4 - (binLength % 4)) % 4;
+    if (pad) chunks.push(Buffer.alloc(pad));
+    const bytes = Buffer.from(view.buffer, view.byteOffset, view.byteLength);
+    json.bufferViews.push({ buffer: 0, byteOffset: binLength + pad, byteLength: bytes.length });
+    chunks.push(bytes);
+    binLength += pad + bytes.length;
+    return json.bufferViews.length - 1;
+  };
+
+  for (const mesh of json.meshes ?? []) {
+    for (const prim of mesh.primitives) {
+      const ext = prim.extensions?.KHR_draco_mesh_compression;
+      if (!ext) continue;
+      const view = json.bufferViews[ext.bufferView];
+      const data = new Int8Array(bin.buffer, bin.byteOffset + (view.byteOffset ?? 0), view.byteLength);
+      const accessors = Object.fromEntries(
+        Object.keys(ext.attributes).map((semantic) => [semantic, json.accessors[prim.attributes[semantic]]]),
+      );
+      const indices = prim.indices !== undefined ? json.accessors[prim.indices] : null;
+      const decoded = decodeDracoPrimitive(draco, data, ext.attributes, accessors, indices);
+
+      for (const [semantic, array] of Object.entries(decoded.attributes)) {
+        Object.assign(accessors[semantic], { bufferView: append(array), byteOffset: 0, count: decoded.count });
+      }
+      if (indices && decoded.index) {
+        Object.assign(indices, { bufferView: append(decoded.index), byteOffset: 0, count: decoded.index.length });
+      }
+      delete prim.extensions.KHR_draco_mesh_compression;
+      if (Object.keys(prim.extensions).length === 0) delete prim.extensions;
+    }
+  }
+
+  const withoutDraco = (list) => list?.filter((name) => name !== 'KHR_draco_mesh_compression');
+  json.extensionsUsed = withoutDraco(json.extensionsUsed);
+  json.extensionsRequired = withoutDraco(json.extensionsRequired);
+  if (json.extensionsRequired?.length === 0) delete json.extensionsRequired;
+  json.buffers[0].byteLength = binLength;
+
+  await fs.writeFile(out, writeGlb(json, Buffer.concat(chunks)));
+}
+
+function writeGlb(json, bin) {
+  const pad = (buffer, fill) => Buffer.concat([buffer, Buffer.alloc((4 - (buffer.length % 4)) % 4, fill)]);
+  const jsonChunk = pad(Buffer.from(JSON.stringify(json)), 0x20);
+  const binChunk = pad(bin, 0);
+  const header = Buffer.alloc(12);
+  header.writeUInt32LE(GLB_MAGIC, 0);
+  header.writeUInt32LE(2, 4);
+  header.writeUInt32LE(12 + 8 + jsonChunk.length + 8 + binChunk.length, 8);
+  const chunkHeader = (length, type) => {
+    const b = Buffer.alloc(8);
+    b.writeUInt32LE(length, 0);
+    b.writeUInt32LE(type, 4);
+    return b;
+  };
+  return Buffer.concat([
+    header,
+    chunkHeader(jsonChunk.length, CHUNK_JSON), jsonChunk,
+    chunkHeader(binChunk.length, CHUNK_BIN), binChunk,
+  ]);
+}
+
+function readGlbJson(buffer) {
+  const jsonLength = buffer.readUInt32LE(12);
+  return JSON.parse(buffer.toString('utf8', 20, 20 + jsonLength));
+}
+
+// GLB の JSON チャンクから三角形数を数える（TRIANGLES モードのみ）
+export function countTriangles(buffer) {
+  const json = readGlbJson(buffer);
+  let triangles = 0;
+  for (const mesh of json.meshes ?? []) {
+    for (const prim of mesh.primitives) {
+      if ((prim.mode ?? 4) !== 4) continue;
+      const accessor = prim.indices ?? prim.attributes.POSITION;
+      triangles += Math.floor(json.accessors[accessor].count / 3);
+    }
+  }
+  return triangles;
+}
+
+function formatBytes(bytes) {
+  return `${(bytes / 1024).toFixed(0)} KB`;
+}
+
+function firstLine(e) {
+  const msg = (e && (e.stderr || e.message)) || String(e);
+  return String(msg).trim().split('\n')[0];
+}
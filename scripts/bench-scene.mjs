@@ -0,0 +1,314 @@
+// 3D シーンのベンチマーク
+// - ビルド済みサイトを `astro preview` で配信し、ソフトウェア GL（SwiftShader）の Chromium で開く
+// - 天気は `?weather-stub`、時間帯は `?period=` で固定（時計は止めないので rAF・タイマーの計測は実時間のまま）
+// - シナリオ: 待機 → Story ブロックのスクロール → クリスタルを順に選択 → 天気を順に手動上書き
+// - シナリオごとに window.__sceneProfile（profileStore.ts）を読み、JSON レポートを書き出す
+// - bench/budgets.json と比較し、超過またはバジェット未登録のシナリオがあれば exit 1
+//
+// 使い方:
+//   npm run build && npm run bench
+//   npm run bench -- --url http://localhost:4321/   （起動済みのサーバーを使う）
+//   npm run bench -- --write-budgets                 （現在の計測値 + 余裕分でバジェットを更新）
+//
+// 初回のみブラウザを取得: `npx playwright install chromium`
+// ※ SwiftShader の数値は実機の GPU 性能ではなく、CPU 側の負荷の相対比較として扱うこと。
+import { spawn } from 'node:child_process';
+import fs from 'node:fs/promises';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..');
+const BUDGETS_PATH = path.join(ROOT, 'bench', 'budgets.json');
+const DEFAULT_OUT = path.join(ROOT, 'bench', 'report.json');
+const PREVIEW_PORT = 4399;
+
+const VIEWPORT = { width: 1280, height: 720 };
+// 時刻ライティングは `?period=` で固定（時計は止めない。rAF・performance.now はそのまま）
+const PERIOD = 'afternoon';
+
+const SETTLE_MS = 2500;         // reveal 後、カメラ演出が落ち着くまで
+const IDLE_MS = 4000;
+const STORY_STEPS = 180;        // Story 区間を何フレームでスクロールするか
+const CRYSTAL_HOLD_MS = 2500;
+const WEATHER_HOLD_MS = 2500;
+const WEATHER_CATEGORIES = ['clear', 'clouds', 'fog', 'rain', 'thunderstorm', 'snow'];
+
+const BUDGET_HEADROOM = 1.25;
+
+/**
+ * @typedef {{
+ *   frames: number,
+ *   timings: Record<string, { total: number, max: number, calls: number }>,
+ *   frameIntervals: number[],
+ *   frameCpu: number[],
+ *   renderer: Record<string, number>,
+ *   rendererPeak: Record<string, number>,
+ * }} ProfileData
+ *
+ * @typedef {{
+ *   maxFrameCpuP95?: number,
+ *   maxFrameIntervalP95?: number,
+ *   maxCalls?: number,
+ *   maxTriangles?: number,
+ *   maxPrograms?: number,
+ *   maxTextureBytes?: number,
+ * }} ScenarioBudget
+ */
+
+function parseArgs(argv) {
+  const args = { url: null, out: DEFAULT_OUT, writeBudgets: false };
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i];
+    if (arg === '--url') args.url = argv[++i];
+    else if (arg === '--out') args.out = path.resolve(argv[++i]);
+    else if (arg === '--write-budgets') args.writeBudgets = true;
+    else throw new Error(`Unknown argument: ${arg}`);
+  }
+  return args;
+}
+
+async function loadPlaywright() {
+  try {
+    return await import('playwright');
+  } catch {
+    throw new Error(
+      'playwright is not installed. Run `npm install && npx playwright install chromium` first.',
+    );
+  }
+}
+
+// --- preview server ---
+
+async function startPreview() {
+  const child = spawn('npx', ['astro', 'preview', '--port', String(PREVIEW_PORT)], {
+    cwd: ROOT,
+    stdio: ['ignore', 'pipe', 'inherit'],
+  });
+  const url = `http://localhost:${PREVIEW_PORT}/`;
+  await new Promise((resolve, reject) => {
+    const timer = setTimeout(() => reject(new Error('astro preview did not start within 30s')), 30_000);
+    child.stdout.on('data', (chunk) => {
+      if (String(chunk).includes(`${PREVIEW_PORT}`)) {
+        clearTimeout(timer);
+        resolve();
+      }
+    });
+    child.on('exit', (code) => {
+      clearTimeout(timer);
+      reject(new Error(`astro preview exited with code ${code}`));
+    });
+  });
+  return { url, stop: () => child.kill() };
+}
+
+// --- statistics ---
+
+function percentile(values, p) {
+  if (values.length === 0) return 0;
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.floor((sorted.length - 1) * p))];
+}
+
+const round = (value) => Math.round(value * 1000) / 1000;
+
+/** @param {ProfileData} data */
+function summarize(data) {
+  const frames = Math.max(1, data.frames);
+  const subscribers = Object.entries(data.timings)
+    .map(([name, t]) => ({
+      name,
+      msPerFrame: round(t.total / frames),
+      maxMs: round(t.max),
+      callsPerFrame: round(t.calls / frames),
+    }))
+    .sort((a, b) => b.msPerFrame - a.msPerFrame);
+  return {
+    frames: data.frames,
+    frameInterval: { p50: round(percentile(data.frameIntervals, 0.5)), p95: round(percentile(data.frameIntervals, 0.95)) },
+    frameCpu: { p50: round(percentile(data.frameCpu, 0.5)), p95: round(percentile(data.frameCpu, 0.95)) },
+    subscribers,
+    rendererPeak: data.rendererPeak,
+  };
+}
+
+// --- scenarios ---
+
+const resetProfile = (page) => page.evaluate(() => window.__sceneProfile.reset());
+const readProfile = (page) => page.evaluate(() => window.__sceneProfile.read());
+
+/** rAF ごとに 1 ステップずつ Story 区間をスクロールする */
+function scrollStory(page) {
+  return page.evaluate((steps) => new Promise((resolve) => {
+    const story = document.getElementById('story');
+    if (!story) throw new Error('#story not found');
+    const start = story.offsetTop - window.innerHeight * 0.5;
+    const end = story.offsetTop + story.offsetHeight;
+    let i = 0;
+    const step = () => {
+      window.scrollTo(0, start + ((end - start) * i) / steps);
+      if (++i <= steps) requestAnimationFrame(step);
+      else resolve();
+    };
+    requestAnimationFrame(step);
+  }), STORY_STEPS);
+}
+
+function dispatch(page, type, detail) {
+  return page.evaluate(([t, d]) => window.dispatchEvent(new CustomEvent(t, { detail: d })), [type, detail]);
+}
+
+async function runScenario(page, name, run) {
+  await resetProfile(page);
+  await run();
+  const summary = summarize(await readProfile(page));
+  console.log(
+    `${name.padEnd(24)} frames ${String(summary.frames).padStart(5)}`
+    + `  interval p95 ${summary.frameInterval.p95.toFixed(1)}ms`
+    + `  cpu p95 ${summary.frameCpu.p95.toFixed(2)}ms`
+    + `  calls ${summary.rendererPeak.calls}`,
+  );
+  return summary;
+}
+
+async function runBenchmark(browser, baseUrl) {
+  const context = await browser.newContext({
+    viewport: VIEWPORT,
+    deviceScaleFactor: 1,
+    geolocation: { latitude: 35.68, longitude: 139.76 },
+    permissions: ['geolocation'],
+    locale: 'ja-JP',
+    timezoneId: 'Asia/Tokyo',
+  });
+
+  const page = await context.newPage();
+
+  const url = new URL(baseUrl);
+  url.searchParams.set('profile', '');
+  url.searchParams.set('quality', 'high');
+  // 天気は「晴れ・東京」のスタブ通信に固定（上書きシナリオで各カテゴリを巡回する）
+  url.searchParams.set('weather-stub', '');
+  url.searchParams.set('period', PERIOD);
+  await page.goto(url.toString());
+  await page.waitForSelector('[data-scene-poster].is-hidden', { state: 'attached', timeout: 60_000 });
+  await page.waitForTimeout(SETTLE_MS);
+
+  const crystalIds = await page.evaluate(
+    () => [...document.querySelectorAll('[data-crystal-id]')].map((el) => el.getAttribute('data-crystal-id')),
+  );
+
+  const scenarios = {};
+  scenarios.idle = await runScenario(page, 'idle', () => page.waitForTimeout(IDLE_MS));
+  scenarios['story-scroll'] = await runScenario(page, 'story-scroll', () => scrollStory(page));
+
+  await page.evaluate(() => window.scrollTo(0, 0));
+  await page.waitForTimeout(SETTLE_MS);
+  for (const id of new Set(crystalIds)) {
+    scenarios[`crystal:${id}`] = await runScenario(page, `crystal:${id}`, async () => {
+      await dispatch(page, 'crystal:activate', { id });
+      await page.waitForTimeout(CRYSTAL_HOLD_MS);
+    });
+  }
+  await dispatch(page, 'crystal:activate', { id: null });
+  await page.waitForTimeout(SETTLE_MS);
+
+  for (const category of WEATHER_CATEGORIES) {
+    scenarios[`weather:${category}`] = await runScenario(page, `weather:${category}`, async () => {
+      await dispatch(page, 'weather:override', { category });
+      await page.waitForTimeout(WEATHER_HOLD_MS);
+    });
+  }
+  await dispatch(page, 'weather:override', { category: null });
+
+  await context.close();
+  return scenarios;
+}
+
+// --- budgets ---
+
+/**
+ * @param {Record<string, ReturnType<typeof summarize>>} scenarios
+ * @param {{ default?: ScenarioBudget, scenarios?: Record<string, ScenarioBudget> }} budgets
+ */
+function checkBudgets(scenarios, budgets) {
+  const violations = [];
+  for (const [name, s] of Object.entries(scenarios)) {
+    const scenarioBudget = budgets.scenarios?.[name];
+    if (!scenarioBudget) {
+      violations.push(`${name}: no budget in bench/budgets.json (run with --write-budgets and commit the result)`);
+      continue;
+    }
+    const budget = { ...budgets.default, ...scenarioBudget };
+    const checks = [
+      ['frameCpu p95', s.frameCpu.p95, budget.maxFrameCpuP95, 'ms'],
+      ['frameInterval p95', s.frameInterval.p95, budget.maxFrameIntervalP95, 'ms'],
+      ['draw calls', s.rendererPeak.calls, budget.maxCalls, ''],
+      ['triangles', s.rendererPeak.triangles, budget.maxTriangles, ''],
+      ['programs', s.rendererPeak.programs, budget.maxPrograms, ''],
+      ['texture bytes', s.rendererPeak.textureBytes, budget.maxTextureBytes, ''],
+    ];
+    for (const [label, value, max, unit] of checks) {
+      if (max !== undefined && value > max) violations.push(`${name}: ${label} ${value}${unit} > budget ${max}${unit}`);
+    }
+  }
+  return violations;
+}
+
+function budgetsFromReport(scenarios) {
+  const headroom = (value) => Math.ceil(value * BUDGET_HEADROOM);
+  const result = {};
+  for (const [name, s] of Object.entries(scenarios)) {
+    result[name] = {
+      maxFrameCpuP95: Math.ceil(s.frameCpu.p95 * BUDGET_HEADROOM * 10) / 10,
+      maxCalls: headroom(s.rendererPeak.calls),
+      maxTriangles: headroom(s.rendererPeak.triangles),
+      maxPrograms: headroom(s.rendererPeak.programs),
+      maxTextureBytes: headroom(s.rendererPeak.textureBytes),
+    };
+  }
+  return result;
+}
+
+// --- main ---
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const { chromium } = await loadPlaywright();
+  const preview = args.url ? null : await startPreview();
+  const browser = await chromium.launch({
+    args: ['--use-gl=angle', '--use-angle=swiftshader', '--enable-unsafe-swiftshader', '--ignore-gpu-blocklist'],
+  });
+
+  let scenarios;
+  try {
+    scenarios = await runBenchmark(browser, args.url ?? preview.url);
+  } finally {
+    await browser.close();
+    preview?.stop();
+  }
+
+  const report = { createdAt: new Date().toISOString(), viewport: VIEWPORT, quality: 'high', scenarios };
+  await fs.mkdir(path.dirname(args.out), { recursive: true });
+  await fs.writeFile(args.out, JSON.stringify(report, null, 2) + '\n');
+  console.log(`\nReport written to ${path.relative(ROOT, args.out)}`);
+
+  const budgets = JSON.parse(await fs.readFile(BUDGETS_PATH, 'utf8'));
+  if (args.writeBudgets) {
+    budgets.scenarios = budgetsFromReport(scenarios);
+    await fs.writeFile(BUDGETS_PATH, JSON.stringify(budgets, null, 2) + '\n');
+    console.log(`Budgets written to ${path.relative(ROOT, BUDGETS_PATH)}`);
+    return;
+  }
+
+  const violations = checkBudgets(scenarios, budgets);
+  if (violations.length > 0) {
+    console.error(`\nPerformance budget exceeded:\n  ${violations.join('\n  ')}`);
+    process.exitCode = 1;
+  } else {
+    console.log('All scenarios within budget.');
+  }
+}
+
+main().catch((e) => {
+  console.error(e);
+  process.exitCode = 1;
+});
@@ -0,0 +1,137 @@
+// ブログ検索の動作チェック
+// - src/lib/blogSearch.ts を typescript の transpileModule で JS に変換して読み込み、
+//   トークナイザーと検索の期待値（c++ / c# / 1 文字のかな・漢字 / 記号のみ）を確かめる
+// - dist/ があれば、ビルド結果に検索インデックス・ページ送り・カテゴリ・タグのページが揃っているかも確かめる
+//
+// 使い方:
+//   npm run check:search                 （ビルド前でも実行できる）
+//   npm run build && npm run check:search
+import assert from 'node:assert/strict';
+import fs from 'node:fs/promises';
+import os from 'node:os';
+import path from 'node:path';
+import { fileURLToPath, pathToFileURL } from 'node:url';
+import ts from 'typescript';
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..');
+const SOURCE = path.join(ROOT, 'src', 'lib', 'blogSearch.ts');
+const DIST = path.join(ROOT, 'dist');
+// src/lib/blog.ts と同じ値
+const POSTS_PER_PAGE = 10;
+
+async function loadBlogSearch() {
+  const { outputText } = ts.transpileModule(await fs.readFile(SOURCE, 'utf8'), {
+    compilerOptions: { module: ts.ModuleKind.ESNext, target: ts.ScriptTarget.ES2022 },
+  });
+  const dir = await fs.mkdtemp(path.join(os.tmpdir(), 'blog-search-'));
+  const file = path.join(dir, 'blogSearch.mjs');
+  await fs.writeFile(file, outputText);
+  try {
+    return await import(pathToFileURL(file).href);
+  } finally {
+    await fs.rm(dir, { recursive: true, force: true });
+  }
+}
+
+const FIXTURES = [
+  {
+    slug: 'cpp-memo',
+    title: 'C++ とメモリ管理',
+    description: 'スマートポインタのまとめ',
+    tags: ['C++'],
+    body: 'unique_ptr と shared_ptr の使い分け。',
+  },
+  {
+    slug: 'csharp-unity',
+    title: 'Unity の C# スクリプト入門',
+    description: 'MonoBehaviour の基本',
+    tags: ['C#', 'Unity'],
+    body: 'Update と FixedUpdate の違い。issue#12 を参照。',
+  },
+  {
+    slug: 'rainy-castle',
+    title: '雨の日の城',
+    description: 'シーンに雨を降らせる',
+    tags: ['three.js'],
+    body: '雨天時はライトを暗くする。',
+  },
+].map((doc, i) => ({
+  category: 'tech',
+  date: `2024.01.0${i + 1}`,
+  datetime: `2024-01-0${i + 1}T00:00:00.000Z`,
+  ...doc,
+}));
+
+function checkSearch({ tokenize, queryTerms, buildSearchIndex, searchIndex }) {
+  // トークナイザー
+  assert.deepEqual(tokenize('C++ と C# と F#'), ['c++', 'c#', 'f#']);
+  assert.deepEqual(tokenize('three.js'), ['three', 'js']);
+  assert.deepEqual(tokenize('issue#12'), ['issue', '12'], '# の後に英数字が続く場合は単語に含めない');
+  assert.deepEqual(tokenize('a の'), [], '文書側は 1 文字の英字・ひらがなを捨てる');
+  assert.deepEqual(queryTerms('a の'), ['a', 'の'], 'クエリ側は 1 文字の英字・ひらがなを残す');
+  assert.deepEqual(queryTerms('!?'), [], '記号だけのクエリは検索語なし');
+
+  const index = buildSearchIndex(FIXTURES);
+  const slugs = (query) => searchIndex(index, query).map((doc) => doc.slug);
+
+  assert.deepEqual(slugs('c++'), ['cpp-memo']);
+  assert.deepEqual(slugs('Ｃ＃'), ['csharp-unity'], '全角も NFKC で揃える');
+  assert.deepEqual(slugs('c#'), ['csharp-unity']);
+  assert.deepEqual(slugs('c'), ['cpp-memo', 'csharp-unity'], '1 文字の英字は前方一致');
+  assert.deepEqual(slugs('雨'), ['rainy-castle'], '1 文字の漢字は含む語に一致');
+  assert.deepEqual(slugs('の'), ['cpp-memo'], '1 文字のひらがなは、かなの語に一致（「のまとめ」→ のま。1 文字だけのかなは索引しない）');
+  assert.deepEqual(slugs('unity スクリプト'), ['csharp-unity']);
+  assert.deepEqual(slugs('存在しないワード'), []);
+  assert.deepEqual(slugs('!?'), []);
+}
+
+async function exists(file) {
+  return fs.access(file).then(() => true, () => false);
+}
+
+// src/lib/blog.ts の tagSlug と同じ変換
+function tagSlug(tag) {
+  return tag.normalize('NFKC').toLowerCase().replace(/[\s/\\?#%&+.:]+/g, '-').replace(/^-+|-+$/g, '');
+}
+
+async function checkDist() {
+  const indexFile = path.join(DIST, 'blog', 'search-index.json');
+  assert.ok(await exists(indexFile), 'dist/blog/search-index.json がない');
+  const { docs } = JSON.parse(await fs.readFile(indexFile, 'utf8'));
+  assert.ok(docs.length > 0, '検索インデックスに記事がない');
+
+  const expected = [path.join('blog', 'index.html')];
+  const lastPage = Math.ceil(docs.length / POSTS_PER_PAGE);
+  for (let page = 2; page <= lastPage; page++) expected.push(path.join('blog', 'page', String(page), 'index.html'));
+  for (const category of new Set(docs.map((doc) => doc.category))) {
+    expected.push(path.join('blog', 'category', category, 'index.html'));
+  }
+  for (const slug of new Set(docs.flatMap((doc) => doc.tags.map(tagSlug)).filter(Boolean))) {
+    expected.push(path.join('blog', 'tag', slug, 'index.html'));
+  }
+  for (const doc of docs) expected.push(path.join('blog', doc.slug, 'index.html'));
+
+  const missing = [];
+  for (const file of expected) {
+    if (!(await exists(path.join(DIST, file)))) missing.push(file);
+  }
+  assert.deepEqual(missing, [], `dist/ に生成されていないページがある`);
+  return expected.length;
+}
+
+async function main() {
+  checkSearch(await loadBlogSearch());
+  console.log('blogSearch: OK');
+
+  if (await exists(DIST)) {
+    const pages = await checkDist();
+    console.log(`dist: OK (search-index.json + ${pages} pages)`);
+  } else {
+    console.log('dist: skipped (run `npm run build` first to check the generated pages)');
+  }
+}
+
+main().catch((e) => {
+  console.error(e);
+  process.exitCode = 1;
+});
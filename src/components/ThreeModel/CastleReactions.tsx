@@ -1,6 +1,9 @@
-import { useRef, useMemo } from 'react'
-import { useFrame } from '@react-three/fiber'
+import { useRef, useMemo, useEffect } from 'react'
 import * as THREE from 'three'
+import { useQuality } from './QualityGovernor'
+import { useFrameBurst } from './RenderScheduler'
+import { useGpuParticles } from './GpuParticles'
+import { useProfiledFrame } from './FrameProfiler'
 
 type IntensityRef = React.MutableRefObject<number>
 
@@ -24,21 +27,23 @@ function WindowShimmer({ intensity }: { intensity: IntensityRef }) {
     [0.05, 0.35, 0.15],
   ] as [number, number, number][], [])
 
-  useFrame(({ clock }) => {
+  useProfiledFrame('WindowShimmer', ({ clock }) => {
     const t = clock.elapsedTime
     const fade = intensity.current
     if (fade < 0.01) {
-      lightsRef.current.forEach(l => { if (l) l.intensity = 0 })
+      for (const l of lightsRef.current) if (l) l.intensity = 0
       return
     }
-    lightsRef.current.forEach((light, i) => {
-      if (!light) return
+    const lights = lightsRef.current
+    for (let i = 0; i < lights.length; i++) {
+      const light = lights[i]
+      if (!light) continue
       // 各窓ごとに位相をずらした sin 波で明滅
       const flicker = Math.sin(t * 3.0 + i * 1.8) * 0.5 + 0.5
       light.intensity = flicker * 2.0 * fade
       // distance の脈動（intensity 連動 + sin 波）
       light.distance = baseDistance * fade + Math.sin(t + i) * 0.1
-    })
+    }
   })
 
   return (
@@ -64,7 +69,7 @@ function AuraSphere({ intensity }: { intensity: IntensityRef }) {
   const outerRef = useRef<THREE.Mesh>(null)
   const innerRef = useRef<THREE.Mesh>(null)
 
-  useFrame(({ clock }) => {
+  useProfiledFrame('AuraSphere', ({ clock }) => {
     const t = clock.elapsedTime
     const fade = intensity.current
 
@@ -122,7 +127,7 @@ function RotatingRings({ intensity }: { intensity: IntensityRef }) {
   const ring1Ref = useRef<THREE.Mesh>(null)
   const ring2Ref = useRef<THREE.Mesh>(null)
 
-  useFrame(({ clock }) => {
+  useProfiledFrame('RotatingRings', ({ clock }) => {
     const t = clock.elapsedTime
     const fade = intensity.current
 
@@ -174,22 +179,36 @@ function RotatingRings({ intensity }: { intensity: IntensityRef }) {
 }
 
 // --- 4. Database: 土台の回路脈動 + 上昇パーティクル ---
+
+// 土台の円周（半径 0.3〜0.8）から上昇。加速度 0.3/s²、寿命 1.5〜3.5s か y=1.0 到達で再生成
+const CIRCUIT_MOTION = /* glsl */ `
+  vec3 particlePosition(vec3 s, vec4 r, inout float alpha) {
+    float angle = s.x * 6.2831853;
+    float radius = 0.3 + s.y * 0.5;
+    vec3 v = vec3((r.x - 0.5) * 0.02, 0.05 + r.y * 0.15, (r.z - 0.5) * 0.02);
+    // y = v.y * t + 0.15 * t^2 が 1.0 に届く時刻で打ち切る
+    float reachTop = (-v.y + sqrt(v.y * v.y + 0.6)) / 0.3;
+    float life = min(1.5 + s.z * 2.0, reachTop);
+    float age = mod(uTime + r.w * life, life);
+    return vec3(
+      cos(angle) * radius + v.x * age,
+      v.y * age + 0.15 * age * age,
+      sin(angle) * radius + v.z * age
+    );
+  }
+`
+
 function CircuitPulse({ intensity }: { intensity: IntensityRef }) {
   const groupRef = useRef<THREE.Group>(null)
-  const meshRef = useRef<THREE.Points>(null)
-  const particleCount = 550
-
-  const particles = useMemo(() => {
-    const positions = new Float32Array(particleCount * 3)
-    const velocities = new Float32Array(particleCount * 3)
-    const lifetimes = new Float32Array(particleCount)
-    for (let i = 0; i < particleCount; i++) {
-      resetParticle(positions, velocities, lifetimes, i)
-    }
-    return { positions, velocities, lifetimes }
-  }, [])
+  const { circuitParticles: particleCount } = useQuality()
+  const { points, uniforms } = useGpuParticles({
+    maxCount: particleCount,
+    motion: CIRCUIT_MOTION,
+    color: '#34d399',
+    size: 0.006,
+  })
 
-  useFrame(({ clock }, delta) => {
+  useProfiledFrame('CircuitPulse', ({ clock }, delta) => {
     const t = clock.elapsedTime
     const fade = intensity.current
 
@@ -200,71 +219,19 @@ function CircuitPulse({ intensity }: { intensity: IntensityRef }) {
       groupRef.current.scale.setScalar(scaleT * breath || 0.001)
     }
 
-    const { positions, velocities, lifetimes } = particles
-
-    for (let i = 0; i < particleCount; i++) {
-      const i3 = i * 3
-      // 上昇（滝の逆）
-      velocities[i3 + 1] += 0.3 * delta
-      positions[i3] += velocities[i3] * delta * fade
-      positions[i3 + 1] += velocities[i3 + 1] * delta * fade
-      positions[i3 + 2] += velocities[i3 + 2] * delta * fade
-      lifetimes[i] -= delta
-      if (lifetimes[i] <= 0 || positions[i3 + 1] > 1.0) {
-        resetParticle(positions, velocities, lifetimes, i)
-      }
-    }
-    if (meshRef.current) {
-      meshRef.current.geometry.attributes.position.needsUpdate = true
-      const mat = meshRef.current.material as THREE.PointsMaterial
-      mat.opacity = fade * 0.7
-    }
+    points.visible = fade > 0.001
+    // 移動量は fade に比例（フェードアウト中は減速）
+    uniforms.uTime.value += delta * fade
+    uniforms.uOpacity.value = fade * 0.7
   })
 
   return (
     <group ref={groupRef}>
-    <points ref={meshRef} position={[0, -0.5, 0]}>
-      <bufferGeometry>
-        <bufferAttribute
-          attach="attributes-position"
-          array={particles.positions}
-          count={particleCount}
-          itemSize={3}
-        />
-      </bufferGeometry>
-      <pointsMaterial
-        size={0.006}
-        color="#34d399"
-        transparent
-        opacity={0}
-        blending={THREE.AdditiveBlending}
-        depthWrite={false}
-        sizeAttenuation
-      />
-    </points>
+      <primitive object={points} position={[0, -0.5, 0]} />
     </group>
   )
 }
 
-function resetParticle(
-  positions: Float32Array,
-  velocities: Float32Array,
-  lifetimes: Float32Array,
-  i: number
-) {
-  const i3 = i * 3
-  // 土台の円周上にランダム配置
-  const angle = Math.random() * Math.PI * 2
-  const radius = 0.3 + Math.random() * 0.5
-  positions[i3] = Math.cos(angle) * radius
-  positions[i3 + 1] = 0
-  positions[i3 + 2] = Math.sin(angle) * radius
-  velocities[i3] = (Math.random() - 0.5) * 0.02
-  velocities[i3 + 1] = 0.05 + Math.random() * 0.15
-  velocities[i3 + 2] = (Math.random() - 0.5) * 0.02
-  lifetimes[i] = 1.5 + Math.random() * 2.0
-}
-
 // --- 5. UI/UX: 城が360°回転（innerGroupRef を外部から制御） ---
 
 // --- Main CastleReactions ---
@@ -287,7 +254,13 @@ export function CastleReactions({ activeCrystalId, innerGroupRef }: CastleReacti
   const uiuxRotation = useRef(0)
   const castleScaleRef = useRef(1.0)
 
-  useFrame(({ clock }, delta) => {
+  // フェードイン/アウト（~0.5s）と城スケールの遷移を demand 描画中も最後まで描く
+  const requestBurst = useFrameBurst()
+  useEffect(() => {
+    requestBurst(2500)
+  }, [activeEffect, requestBurst])
+
+  useProfiledFrame('CastleReactions', ({ clock }, delta) => {
     const t = clock.elapsedTime
     const speed = 2.0 * delta // ~0.5秒で 0→1
 
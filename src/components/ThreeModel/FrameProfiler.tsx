@@ -0,0 +1,89 @@
+import { useEffect, useRef } from 'react'
+import { addAfterEffect, addEffect, useFrame, useThree, type RenderCallback } from '@react-three/fiber'
+import * as THREE from 'three'
+import { useQuality } from './QualityGovernor'
+import { PROFILING, recordFrame, recordTiming, rendererStats } from './profileStore'
+
+// --- Canvas 内の計測（PROFILING 時のみ有効） ---
+// - useProfiledFrame: useFrame の購読者ごとの CPU 時間
+// - FrameProfiler: フレーム全体の CPU 時間・rAF 間隔、priority 1 の描画パス（EffectComposer /
+//   DirectRenderer）の時間、テクスチャの推定メモリ
+
+/** useFrame + 名前付き計測（PROFILING でなければ useFrame と同じ） */
+export function useProfiledFrame(name: string, callback: RenderCallback, priority?: number) {
+  useFrame(PROFILING
+    ? (state, delta, frame) => {
+        const start = performance.now()
+        callback(state, delta, frame)
+        recordTiming(name, performance.now() - start)
+      }
+    : callback, priority)
+}
+
+// 描画パス（priority 1）の前後に差し込むマーカー
+const PASS_BEFORE = 0.999
+const PASS_AFTER = 1.001
+const TEXTURE_SCAN_INTERVAL = 60 // frames
+
+function estimateTextureBytes(texture: THREE.Texture): number {
+  const mipmaps = (texture as THREE.CompressedTexture).mipmaps as { data?: ArrayBufferView }[] | undefined
+  if ((texture as THREE.CompressedTexture).isCompressedTexture && mipmaps?.length) {
+    return mipmaps.reduce((sum, m) => sum + (m.data?.byteLength ?? 0), 0)
+  }
+  const image = texture.image as { width?: number; height?: number } | undefined
+  if (!image?.width || !image?.height) return 0
+  const base = image.width * image.height * 4
+  return texture.generateMipmaps ? Math.round(base * 4 / 3) : base
+}
+
+function scanTextureBytes(scene: THREE.Scene): number {
+  const seen = new Set<THREE.Texture>()
+  scene.traverse((obj) => {
+    const material = (obj as THREE.Mesh).material
+    if (!material) return
+    for (const m of Array.isArray(material) ? material : [material]) {
+      for (const value of Object.values(m)) {
+        if (value instanceof THREE.Texture) seen.add(value)
+      }
+    }
+  })
+  let bytes = 0
+  seen.forEach((t) => { bytes += estimateTextureBytes(t) })
+  return bytes
+}
+
+function ProfilerProbes() {
+  const scene = useThree((s) => s.scene)
+  const { bloom } = useQuality()
+  const passStartRef = useRef(0)
+
+  useFrame(() => { passStartRef.current = performance.now() }, PASS_BEFORE)
+  useFrame(() => {
+    recordTiming(bloom ? 'EffectComposer' : 'DirectRenderer', performance.now() - passStartRef.current)
+  }, PASS_AFTER)
+
+  useEffect(() => {
+    let frameStart = 0
+    let lastStart = 0
+    let frames = 0
+    const unsubscribeBefore = addEffect(() => {
+      frameStart = performance.now()
+    })
+    const unsubscribeAfter = addAfterEffect(() => {
+      const now = performance.now()
+      if (lastStart > 0) recordFrame(frameStart - lastStart, now - frameStart)
+      lastStart = frameStart
+      if (frames++ % TEXTURE_SCAN_INTERVAL === 0) rendererStats.textureBytes = scanTextureBytes(scene)
+    })
+    return () => {
+      unsubscribeBefore()
+      unsubscribeAfter()
+    }
+  }, [scene])
+
+  return null
+}
+
+export function FrameProfiler() {
+  return PROFILING ? <ProfilerProbes /> : null
+}
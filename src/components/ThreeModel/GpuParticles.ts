@@ -0,0 +1,149 @@
+import { useEffect, useMemo } from 'react'
+import { useThree } from '@react-three/fiber'
+import * as THREE from 'three'
+
+// --- GPU パーティクルエンジン ---
+// 粒子の動きは頂点シェーダーで seed 属性 + uTime から算出する。
+// バッファは生成時に 1 回だけアップロードし、毎フレームの CPU 処理は
+// uniform 更新と drawRange（アクティブ数）のみ = O(1)。
+//
+// 各システムは GLSL の motion 関数を渡す:
+//   vec3 particlePosition(vec3 s, vec4 r, inout float alpha)
+//   - s: position 属性（[0,1) の乱数 ×3）
+//   - r: aSeed 属性（[0,1) の乱数 ×4）
+//   - alpha: 1.0 で渡される（変更しなければ不透明）
+//   - 共通 uniform: uTime / uIntensity / uWind
+
+export type ParticleShape = 'square' | 'glow'
+
+export interface GpuParticleOptions {
+  maxCount: number
+  motion: string
+  color: string
+  size: number
+  /** square: PointsMaterial 相当の四角 / glow: drei Sparkles 相当の光点 */
+  shape?: ParticleShape
+  /** world: PointsMaterial の sizeAttenuation 相当 / pixel: drei Sparkles 相当 */
+  sizeMode?: 'world' | 'pixel'
+  blending?: THREE.Blending
+}
+
+export interface GpuParticleUniforms {
+  uTime: THREE.IUniform<number>
+  uIntensity: THREE.IUniform<number>
+  uWind: THREE.IUniform<number>
+  uOpacity: THREE.IUniform<number>
+  uSize: THREE.IUniform<number>
+  uScale: THREE.IUniform<number>
+  uColor: THREE.IUniform<THREE.Color>
+}
+
+export interface GpuParticleSystem {
+  points: THREE.Points<THREE.BufferGeometry, THREE.ShaderMaterial>
+  uniforms: GpuParticleUniforms
+  /** 描画する粒子数（0〜maxCount） */
+  setCount: (count: number) => void
+}
+
+const vertexShader = (motion: string) => /* glsl */ `
+  uniform float uTime;
+  uniform float uIntensity;
+  uniform float uWind;
+  uniform float uSize;
+  uniform float uScale;
+  attribute vec4 aSeed;
+  varying float vAlpha;
+
+  ${motion}
+
+  void main() {
+    float alpha = 1.0;
+    vec3 p = particlePosition(position, aSeed, alpha);
+    vAlpha = alpha;
+    vec4 mvPosition = modelViewMatrix * vec4(p, 1.0);
+    gl_Position = projectionMatrix * mvPosition;
+    gl_PointSize = uSize * (uScale / -mvPosition.z);
+  }
+`
+
+const fragmentShader = /* glsl */ `
+  uniform vec3 uColor;
+  uniform float uOpacity;
+  varying float vAlpha;
+
+  void main() {
+    #ifdef GLOW
+      float d = distance(gl_PointCoord, vec2(0.5));
+      float strength = 0.05 / d - 0.1;
+    #else
+      float strength = 1.0;
+    #endif
+    gl_FragColor = vec4(uColor, strength * vAlpha * uOpacity);
+    #include <tonemapping_fragment>
+    #include <colorspace_fragment>
+  }
+`
+
+export function useGpuParticles({
+  maxCount,
+  motion,
+  color,
+  size,
+  shape = 'square',
+  sizeMode = 'world',
+  blending = THREE.AdditiveBlending,
+}: GpuParticleOptions): GpuParticleSystem {
+  const system = useMemo(() => {
+    const seeds = new Float32Array(maxCount * 3)
+    const seedsB = new Float32Array(maxCount * 4)
+    for (let i = 0; i < seeds.length; i++) seeds[i] = Math.random()
+    for (let i = 0; i < seedsB.length; i++) seedsB[i] = Math.random()
+
+    const geometry = new THREE.BufferGeometry()
+    geometry.setAttribute('position', new THREE.BufferAttribute(seeds, 3))
+    geometry.setAttribute('aSeed', new THREE.BufferAttribute(seedsB, 4))
+
+    const uniforms: GpuParticleUniforms = {
+      uTime: { value: 0 },
+      uIntensity: { value: 1 },
+      uWind: { value: 0 },
+      uOpacity: { value: 0 },
+      uSize: { value: size },
+      uScale: { value: 1 },
+      uColor: { value: new THREE.Color(color) },
+    }
+    const material = new THREE.ShaderMaterial({
+      uniforms: uniforms as unknown as Record<string, THREE.IUniform>,
+      vertexShader: vertexShader(motion),
+      fragmentShader,
+      defines: shape === 'glow' ? { GLOW: '' } : {},
+      transparent: true,
+      depthWrite: false,
+      blending,
+    })
+
+    const points = new THREE.Points(geometry, material)
+    // 位置はシェーダー側で決まるため、seed 由来のバウンディングでカリングしない
+    points.frustumCulled = false
+
+    const setCount = (count: number) => {
+      geometry.setDrawRange(0, Math.max(0, Math.min(maxCount, Math.floor(count))))
+    }
+
+    return { points, uniforms, setCount }
+  }, [maxCount, motion, color, size, shape, blending])
+
+  // サイズ減衰のスケール（PointsMaterial と同じく描画バッファ高さの半分）
+  const height = useThree((s) => s.size.height)
+  const dpr = useThree((s) => s.viewport.dpr)
+  useEffect(() => {
+    system.uniforms.uScale.value = sizeMode === 'world' ? height * dpr * 0.5 : 25 * dpr
+  }, [system, sizeMode, height, dpr])
+
+  useEffect(() => () => {
+    system.points.geometry.dispose()
+    system.points.material.dispose()
+  }, [system])
+
+  return system
+}
@@ -0,0 +1,141 @@
+import { createContext, useContext, useEffect, useMemo, useRef, type MutableRefObject, type ReactNode, type RefObject } from 'react'
+import { createPortal, useThree } from '@react-three/fiber'
+import * as THREE from 'three'
+import { useModelAtLod } from './modelAssets'
+import { getActorParts, type MaterialPrepare } from './sceneRegistry'
+import { useProfiledFrame } from './FrameProfiler'
+
+// --- インスタンス描画アクター ---
+// 同じ GLB を使う複数のアクター（鳥の群れ）をパーツごとに 1 つの InstancedMesh で描画する。
+// 各アクターは空の group（位置・回転・スケール）とパラメータを登録するだけで、
+// ドローコールはアクター数ではなく GLB のパーツ数で決まる。
+// 1 体しか出ないモデル（ドローン・リング・各結晶）には使わない（ドローコールは減らず、
+// マテリアルのパッチ・インスタンス行列の更新コストだけが増える）。
+
+export interface ActorParams {
+  emissive: number
+  opacity: number
+}
+
+export interface ActorInstance {
+  /** ワールド行列の取得元（アクター側で毎フレーム動かす group） */
+  object: RefObject<THREE.Object3D>
+  params: MutableRefObject<ActorParams>
+}
+
+interface InstancerApi {
+  register: (instance: ActorInstance) => () => void
+}
+
+const InstancerContext = createContext<Record<string, InstancerApi>>({})
+
+/** 最寄りの <InstancedActor url={url}> にアクターを登録する */
+export function useActorInstance(url: string, instance: ActorInstance) {
+  const api = useContext(InstancerContext)[url]
+
+  useEffect(() => {
+    if (!api) return
+    return api.register({ object: instance.object, params: instance.params })
+  }, [api, instance.object, instance.params])
+}
+
+interface InstancedActorProps {
+  url: string
+  /** 同時に登録できるアクター数の上限 */
+  capacity: number
+  /** マテリアル補正の識別子（同じ variant は同じマテリアルを共有） */
+  variant?: string
+  prepare?: MaterialPrepare
+  /** GLB の LOD（変更時は読み込み完了まで表示中の LOD を使い続ける） */
+  lod?: number
+  children: ReactNode
+}
+
+export function InstancedActor({ url, capacity, variant, prepare, lod = 0, children }: InstancedActorProps) {
+  const { scene } = useModelAtLod(url, lod)
+  const rootScene = useThree((s) => s.scene)
+  const parts = useMemo(() => getActorParts(scene, variant, prepare), [scene, variant, prepare])
+  const instancesRef = useRef<ActorInstance[]>([])
+  const meshRefs = useRef<(THREE.InstancedMesh | null)[]>([])
+
+  // パーツごとに元 geometry の属性バッファを共有しつつ instanceParams を追加
+  const { geometries, paramsAttr } = useMemo(() => {
+    const paramsAttr = new THREE.InstancedBufferAttribute(new Float32Array(capacity * 2), 2)
+    paramsAttr.setUsage(THREE.DynamicDrawUsage)
+    const geometries = parts.map(({ geometry }) => {
+      const geo = new THREE.BufferGeometry()
+      geo.setIndex(geometry.index)
+      Object.entries(geometry.attributes).forEach(([name, attr]) => geo.setAttribute(name, attr))
+      // マルチマテリアルのパーツはグループごとに対応するマテリアルで描画される
+      geometry.groups.forEach(({ start, count, materialIndex }) => geo.addGroup(start, count, materialIndex))
+      geo.setAttribute('instanceParams', paramsAttr)
+      return geo
+    })
+    return { geometries, paramsAttr }
+  }, [parts, capacity])
+
+  useEffect(() => () => geometries.forEach((g) => g.dispose()), [geometries])
+
+  const api = useMemo<InstancerApi>(() => ({
+    register(instance) {
+      instancesRef.current.push(instance)
+      return () => {
+        instancesRef.current = instancesRef.current.filter((i) => i !== instance)
+      }
+    },
+  }), [])
+
+  const parentApis = useContext(InstancerContext)
+  const apis = useMemo(() => ({ ...parentApis, [url]: api }), [parentApis, url, api])
+
+  const tmpMatrix = useMemo(() => new THREE.Matrix4(), [])
+
+  // 子アクターの useFrame（位置更新）の後に実行される
+  useProfiledFrame(`InstancedActor ${url}`, () => {
+    const instances = instancesRef.current
+    const count = Math.min(instances.length, capacity)
+    const params = paramsAttr.array as Float32Array
+    const meshes = meshRefs.current
+
+    for (let i = 0; i < count; i++) {
+      const inst = instances[i]
+      const obj = inst.object.current
+      params[i * 2] = inst.params.current.emissive
+      params[i * 2 + 1] = inst.params.current.opacity
+      if (obj) obj.updateWorldMatrix(true, false)
+      for (let p = 0; p < meshes.length; p++) {
+        const mesh = meshes[p]
+        if (!mesh) continue
+        if (obj && obj.visible) tmpMatrix.multiplyMatrices(obj.matrixWorld, parts[p].matrix)
+        else tmpMatrix.makeScale(0, 0, 0)
+        mesh.setMatrixAt(i, tmpMatrix)
+      }
+    }
+    for (const mesh of meshes) {
+      if (!mesh) continue
+      mesh.count = count
+      mesh.instanceMatrix.needsUpdate = true
+    }
+    paramsAttr.needsUpdate = true
+  })
+
+  return (
+    <InstancerContext.Provider value={apis}>
+      {children}
+      {/* ワールド行列で配置するため、シーン直下に描画 */}
+      {createPortal(
+        <>
+          {parts.map((part, i) => (
+            <instancedMesh
+              key={i}
+              ref={(el) => { meshRefs.current[i] = el }}
+              args={[geometries[i], part.material, capacity]}
+              frustumCulled={false}
+            />
+          ))}
+        </>,
+        rootScene,
+      )}
+    </InstancerContext.Provider>
+  )
+}
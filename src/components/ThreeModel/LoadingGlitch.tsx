@@ -1,5 +1,5 @@
 import { useRef, useEffect, useState } from 'react';
-import { useProgress } from '@react-three/drei';
+import type { StageProgress } from './sceneStages';
 import styl from './index.module.styl';
 
 type Phase = 'glitching' | 'clean' | 'fading';
@@ -9,11 +9,14 @@ const FADE_DURATION = 600;
 const BRAND_TEXT = 'SP WEBCREAT.';
 
 interface LoadingGlitchProps {
+  /** 段階ロードの進捗（先頭 = 城ステージ。これの完了で演出を終える） */
+  stages: StageProgress[];
   onTransitionComplete: () => void;
 }
 
-export default function LoadingGlitch({ onTransitionComplete }: LoadingGlitchProps) {
-  const { progress } = useProgress();
+export default function LoadingGlitch({ stages, onTransitionComplete }: LoadingGlitchProps) {
+  // 3D チャンクの読み込み前は stages が空 = 0%
+  const progress = (stages[0]?.progress ?? 0) * 100;
   const [phase, setPhase] = useState<Phase>('glitching');
   const [displayProgress, setDisplayProgress] = useState(0);
   const rafRef = useRef(0);
@@ -97,6 +100,15 @@ export default function LoadingGlitch({ onTransitionComplete }: LoadingGlitchPro
         </div>
         <span className={styl.glitchNum}>{displayProgress}%</span>
       </div>
+
+      {/* ステージ別の進捗（後続ステージは演出終了後もバックグラウンドで継続） */}
+      <ul className={styl.glitchStages}>
+        {stages.map((stage) => (
+          <li key={stage.id} data-done={stage.progress >= 1 || undefined}>
+            {stage.label} {Math.round(stage.progress * 100)}%
+          </li>
+        ))}
+      </ul>
     </div>
   );
 }
@@ -0,0 +1,97 @@
+import { useEffect, useState } from 'react'
+import { PROFILING, readProfile, resetProfile, rendererStats, type ProfileData } from './profileStore'
+import styl from './index.module.styl'
+
+// --- プロファイリング HUD（dev / ?profile のみ） ---
+// Time / Weather トグルと同じ見た目のボタンで開閉し、直近 0.5 秒の
+// useFrame 購読者ごとの CPU 時間と renderer.info を表示する。
+// 開いている間は 0.5 秒ごとに集計をリセットする（ベンチマーク実行中は開かないこと）。
+
+const SAMPLE_INTERVAL = 500 // ms
+
+interface HudSample {
+  fps: number
+  cpu: number
+  rows: { name: string; ms: number; calls: number; max: number }[]
+  renderer: typeof rendererStats
+}
+
+function summarize(data: ProfileData, elapsed: number): HudSample {
+  const frames = Math.max(1, data.frames)
+  const cpu = data.frameCpu.length > 0
+    ? data.frameCpu.reduce((a, b) => a + b, 0) / data.frameCpu.length
+    : 0
+  const rows = Object.entries(data.timings)
+    .map(([name, t]) => ({ name, ms: t.total / frames, calls: t.calls / frames, max: t.max }))
+    .sort((a, b) => b.ms - a.ms)
+  return { fps: (data.frames * 1000) / elapsed, cpu, rows, renderer: { ...rendererStats } }
+}
+
+const formatBytes = (bytes: number) => `${(bytes / (1024 * 1024)).toFixed(1)} MB`
+
+function HudPanel() {
+  const [sample, setSample] = useState<HudSample | null>(null)
+
+  useEffect(() => {
+    resetProfile()
+    let last = performance.now()
+    const timer = setInterval(() => {
+      const now = performance.now()
+      setSample(summarize(readProfile(), now - last))
+      resetProfile()
+      last = now
+    }, SAMPLE_INTERVAL)
+    return () => clearInterval(timer)
+  }, [])
+
+  if (!sample) return <div className={styl.profilerHud}>sampling…</div>
+
+  const r = sample.renderer
+  return (
+    <div className={styl.profilerHud}>
+      <div className={styl.profilerSummary}>
+        {sample.fps.toFixed(0)} fps · CPU {sample.cpu.toFixed(2)} ms/frame
+      </div>
+      <div className={styl.profilerSummary}>
+        calls {r.calls} · tris {r.triangles.toLocaleString()} · points {r.points.toLocaleString()}
+      </div>
+      <div className={styl.profilerSummary}>
+        programs {r.programs} · geo {r.geometries} · tex {r.textures} ({formatBytes(r.textureBytes)})
+      </div>
+      <table className={styl.profilerTable}>
+        <thead>
+          <tr><th>useFrame</th><th>ms/frame</th><th>max</th><th>×</th></tr>
+        </thead>
+        <tbody>
+          {sample.rows.map((row) => (
+            <tr key={row.name}>
+              <td>{row.name}</td>
+              <td>{row.ms.toFixed(3)}</td>
+              <td>{row.max.toFixed(2)}</td>
+              <td>{row.calls.toFixed(0)}</td>
+            </tr>
+          ))}
+        </tbody>
+      </table>
+    </div>
+  )
+}
+
+export function ProfilerHud() {
+  const [open, setOpen] = useState(false)
+  if (!PROFILING) return null
+
+  return (
+    <>
+      <button
+        className={styl.profilerToggle}
+        onClick={() => setOpen(v => !v)}
+        data-active={open || undefined}
+        aria-label="Toggle profiler"
+      >
+        {open ? '⏱ Profile ON' : '⏱ Profile OFF'}
+      </button>
+      {open && <HudPanel />}
+    </>
+  )
+}
@@ -0,0 +1,95 @@
+import { createContext, useContext, useEffect, useRef, type ReactNode } from 'react'
+import { useFrame, useThree } from '@react-three/fiber'
+import { QUALITY_TIERS, MAX_TIER, type QualityBudget } from './qualityTiers'
+
+// --- Context: ThreeModel 配下の全コンポーネントはここから予算を読む ---
+
+const QualityContext = createContext<QualityBudget>(QUALITY_TIERS[MAX_TIER])
+
+export function useQuality(): QualityBudget {
+  return useContext(QualityContext)
+}
+
+export function QualityProvider({ tier, children }: { tier: number; children: ReactNode }) {
+  return (
+    <QualityContext.Provider value={QUALITY_TIERS[tier]}>
+      {children}
+    </QualityContext.Provider>
+  )
+}
+
+// --- Governor: 実測フレーム時間でティアを上下させる ---
+
+const WINDOW_FRAMES = 60        // 1サンプル窓のフレーム数
+const MAX_SAMPLE_DELTA = 0.25   // s — タブ復帰などの外れ値は捨てる
+const DOWNGRADE_MS = 22         // 平均がこれを超えたら遅い（≒45fps 未満）
+const UPGRADE_MS = 18           // 平均がこれ未満なら余裕あり（60Hz で vsync 張り付き）
+const DOWNGRADE_WINDOWS = 2     // 連続 2 窓遅ければ 1 段下げる
+const UPGRADE_WINDOWS = 8       // 連続 8 窓速ければ 1 段上げる
+const COOLDOWN_WINDOWS = 2      // ティア変更直後の窓は計測しない（シェーダーコンパイル等）
+
+interface QualityGovernorProps {
+  /** CameraReveal 完了後のみ計測する */
+  active: boolean
+  tier: number
+  onChangeTier: (tier: number) => void
+}
+
+export function QualityGovernor({ active, tier, onChangeTier }: QualityGovernorProps) {
+  const setDpr = useThree((s) => s.setDpr)
+  const budget = QUALITY_TIERS[tier]
+
+  useEffect(() => {
+    setDpr(Math.min(window.devicePixelRatio, budget.dpr))
+  }, [budget.dpr, setDpr])
+
+  const sampler = useRef({
+    frames: 0,
+    total: 0,
+    slowWindows: 0,
+    fastWindows: 0,
+    cooldown: COOLDOWN_WINDOWS,
+    // ティアごとの降格回数 — 降格したティアへの再昇格ほど慎重に（ヒステリシス）
+    failures: new Array<number>(QUALITY_TIERS.length).fill(0),
+  })
+
+  useFrame((_, delta) => {
+    if (!active || delta > MAX_SAMPLE_DELTA) return
+    const s = sampler.current
+    s.frames++
+    s.total += delta
+    if (s.frames < WINDOW_FRAMES) return
+
+    const avgMs = (s.total / s.frames) * 1000
+    s.frames = 0
+    s.total = 0
+
+    if (s.cooldown > 0) {
+      s.cooldown--
+      return
+    }
+
+    if (avgMs > DOWNGRADE_MS) {
+      s.fastWindows = 0
+      if (++s.slowWindows >= DOWNGRADE_WINDOWS && tier > 0) {
+        s.failures[tier]++
+        s.slowWindows = 0
+        s.cooldown = COOLDOWN_WINDOWS
+        onChangeTier(tier - 1)
+      }
+    } else if (avgMs < UPGRADE_MS) {
+      s.slowWindows = 0
+      const required = UPGRADE_WINDOWS * 2 ** s.failures[Math.min(tier + 1, MAX_TIER)]
+      if (++s.fastWindows >= required && tier < MAX_TIER) {
+        s.fastWindows = 0
+        s.cooldown = COOLDOWN_WINDOWS
+        onChangeTier(tier + 1)
+      }
+    } else {
+      s.slowWindows = 0
+      s.fastWindows = 0
+    }
+  })
+
+  return null
+}
@@ -0,0 +1,119 @@
+import { createContext, useCallback, useContext, useEffect, useRef, useState, type ReactNode, type RefObject } from 'react'
+import { addEffect, useThree } from '@react-three/fiber'
+import { useProfiledFrame } from './FrameProfiler'
+
+// --- レンダースケジューラー ---
+// Canvas が画面外 / タブ非表示 / 本文（main-content）閲覧中は frameloop="demand" に切り替え、
+// スクロール（Story 進捗を含む）・ポインター・天気などのイベント時のみ描画する。
+// アニメーション側は useFrameBurst() で上限付きの連続フレームを要求できる。
+
+export type SceneFrameloop = 'always' | 'demand'
+
+const MAX_BURST_MS = 5000
+const SCROLL_BURST_MS = 600     // カメラ・速度の lerp が落ち着くまで
+const POINTER_BURST_MS = 1000   // MouseParallax の lerp(0.05) が追いつくまで
+const MAX_FRAME_GAP_MS = 100    // これ以上空いたフレームは 1 フレーム分の delta に丸める
+
+/**
+ * 表示状態から frameloop を決める（Canvas 外で使用）
+ * - containerRef: Canvas のコンテナ（IntersectionObserver）
+ * - [data-scene-focus] 要素（FV / Story）が 1 つも画面内になければ本文閲覧中とみなす
+ */
+export function useSceneFrameloop(containerRef: RefObject<HTMLElement>, forceAlways: boolean): SceneFrameloop {
+  const [inView, setInView] = useState(true)
+  const [focusVisible, setFocusVisible] = useState(true)
+  const [docVisible, setDocVisible] = useState(true)
+
+  useEffect(() => {
+    const el = containerRef.current
+    if (!el) return
+    const observer = new IntersectionObserver(([entry]) => setInView(entry.isIntersecting))
+    observer.observe(el)
+    return () => observer.disconnect()
+  }, [containerRef])
+
+  useEffect(() => {
+    const targets = document.querySelectorAll('[data-scene-focus]')
+    if (targets.length === 0) return
+    const visible = new Set<Element>()
+    const observer = new IntersectionObserver((entries) => {
+      entries.forEach((entry) => {
+        if (entry.isIntersecting) visible.add(entry.target)
+        else visible.delete(entry.target)
+      })
+      setFocusVisible(visible.size > 0)
+    })
+    targets.forEach((t) => observer.observe(t))
+    return () => observer.disconnect()
+  }, [])
+
+  useEffect(() => {
+    const update = () => setDocVisible(document.visibilityState === 'visible')
+    update()
+    document.addEventListener('visibilitychange', update)
+    return () => document.removeEventListener('visibilitychange', update)
+  }, [])
+
+  return forceAlways || (inView && focusVisible && docVisible) ? 'always' : 'demand'
+}
+
+// --- Canvas 内: 無効化イベント + バースト + クロック補正 ---
+
+const BurstContext = createContext<(ms: number) => void>(() => {})
+
+/** 上限付きの連続フレームを要求する（demand 中のみ有効、always 中は no-op） */
+export function useFrameBurst(): (ms: number) => void {
+  return useContext(BurstContext)
+}
+
+interface RenderSchedulerProps {
+  frameloop: SceneFrameloop
+  children: ReactNode
+}
+
+export function RenderScheduler({ frameloop, children }: RenderSchedulerProps) {
+  const invalidate = useThree((s) => s.invalidate)
+  const clock = useThree((s) => s.clock)
+  const burstUntilRef = useRef(0)
+
+  const requestBurst = useCallback((ms: number) => {
+    const until = performance.now() + Math.min(ms, MAX_BURST_MS)
+    if (until > burstUntilRef.current) burstUntilRef.current = until
+    invalidate()
+  }, [invalidate])
+
+  // demand 中はバースト期限まで毎フレーム次フレームを予約
+  useProfiledFrame('RenderScheduler', () => {
+    if (frameloop === 'demand' && performance.now() < burstUntilRef.current) invalidate()
+  })
+
+  // 再開時・demand の単発フレームで delta が跳ねないよう Clock を補正
+  // （停止していた時間は経過させず、1 フレーム分だけ進める）
+  useEffect(() => {
+    let last = performance.now()
+    return addEffect(() => {
+      const now = performance.now()
+      if (now - last > MAX_FRAME_GAP_MS) clock.oldTime = now - 1000 / 60
+      last = now
+    })
+  }, [clock])
+
+  // demand 中の描画トリガー
+  useEffect(() => {
+    if (frameloop !== 'demand') return
+    const onScroll = () => requestBurst(SCROLL_BURST_MS)
+    const onPointer = () => requestBurst(POINTER_BURST_MS)
+    window.addEventListener('scroll', onScroll, { passive: true })
+    window.addEventListener('pointermove', onPointer, { passive: true })
+    return () => {
+      window.removeEventListener('scroll', onScroll)
+      window.removeEventListener('pointermove', onPointer)
+    }
+  }, [frameloop, requestBurst])
+
+  return (
+    <BurstContext.Provider value={requestBurst}>
+      {children}
+    </BurstContext.Provider>
+  )
+}
@@ -0,0 +1,42 @@
+import { useEffect } from 'react'
+import { addAfterEffect, addEffect, useThree } from '@react-three/fiber'
+import { PROFILING, rendererStats, recordRendererPeak } from './profileStore'
+
+// --- renderer.info の 1 フレーム分スナップショット ---
+// EffectComposer・AfterBloomRenderer で 1 フレームに複数回 render されるため、
+// autoReset を切ってフレーム単位で集計する。
+// dev または ?stats 付きで window.__rendererStats から参照できる（値は profileStore に保持）。
+
+export { rendererStats }
+
+export function RendererStats() {
+  const gl = useThree((s) => s.gl)
+
+  useEffect(() => {
+    gl.info.autoReset = false
+    const unsubscribeBefore = addEffect(() => gl.info.reset())
+    const unsubscribeAfter = addAfterEffect(() => {
+      const { render, memory, programs } = gl.info
+      rendererStats.calls = render.calls
+      rendererStats.triangles = render.triangles
+      rendererStats.points = render.points
+      rendererStats.lines = render.lines
+      rendererStats.programs = programs?.length ?? 0
+      rendererStats.geometries = memory.geometries
+      rendererStats.textures = memory.textures
+      if (PROFILING) recordRendererPeak()
+    })
+
+    if (import.meta.env.DEV || new URLSearchParams(window.location.search).has('stats')) {
+      (window as any).__rendererStats = rendererStats
+    }
+
+    return () => {
+      unsubscribeBefore()
+      unsubscribeAfter()
+      gl.info.autoReset = true
+    }
+  }, [gl])
+
+  return null
+}
@@ -1,8 +1,11 @@
-import { useRef, useMemo, useState, useEffect, type MutableRefObject } from 'react'
-import { useFrame } from '@react-three/fiber'
-import { useGLTF, useAnimations } from '@react-three/drei'
+import { useRef, useMemo, useEffect, type MutableRefObject } from 'react'
 import { clone as skeletonClone } from 'three/examples/jsm/utils/SkeletonUtils.js'
 import * as THREE from 'three'
+import { useModel } from './modelAssets'
+import { InstancedActor, useActorInstance, type ActorParams } from './InstancedActor'
+import { useQuality } from './QualityGovernor'
+import { createLookupTable, findKeyframe, keyframeFraction, sampleLookupTable1 } from './lookupTable'
+import { useProfiledFrame } from './FrameProfiler'
 
 // --- Utilities ---
 
@@ -14,34 +17,29 @@ const CYAN_BOOST_CONFIG = [
   { at: 1.00, boost: 1.0 },
 ]
 
-/** Scroll progress (0-1) to cyan emissive boost (0.2-1.0) */
+const CYAN_BOOST_LUT = createLookupTable(1, (t, out) => {
+  const i = findKeyframe(CYAN_BOOST_CONFIG, t)
+  const f = keyframeFraction(CYAN_BOOST_CONFIG, i, t)
+  out[0] = THREE.MathUtils.lerp(CYAN_BOOST_CONFIG[i].boost, CYAN_BOOST_CONFIG[i + 1].boost, f)
+})
+
+/** Scroll progress (0-1) to cyan emissive boost (0.2-1.0) — precomputed lookup table */
 export function getScrollCyanBoost(scroll: number): number {
-  let lower = CYAN_BOOST_CONFIG[0]
-  let upper = CYAN_BOOST_CONFIG[CYAN_BOOST_CONFIG.length - 1]
-  for (let i = 0; i < CYAN_BOOST_CONFIG.length - 1; i++) {
-    if (scroll >= CYAN_BOOST_CONFIG[i].at && scroll <= CYAN_BOOST_CONFIG[i + 1].at) {
-      lower = CYAN_BOOST_CONFIG[i]
-      upper = CYAN_BOOST_CONFIG[i + 1]
-      break
-    }
-  }
-  const range = upper.at - lower.at || 1
-  const t = (scroll - lower.at) / range
-  return THREE.MathUtils.lerp(lower.boost, upper.boost, t)
+  return sampleLookupTable1(CYAN_BOOST_LUT, scroll)
 }
 
-/** Mobile detection hook */
-export function useMobile(breakpoint = 768): boolean {
-  const [isMobile, setIsMobile] = useState(false)
-
-  useEffect(() => {
-    const check = () => setIsMobile(window.innerWidth < breakpoint)
-    check()
-    window.addEventListener('resize', check)
-    return () => window.removeEventListener('resize', check)
-  }, [breakpoint])
-
-  return isMobile
+/** 非黒の emissive を持つマテリアル（スクロール連動で発光強度を変える対象） */
+export function collectEmissiveMaterials(root: THREE.Object3D): THREE.MeshStandardMaterial[] {
+  const mats: THREE.MeshStandardMaterial[] = []
+  root.traverse((child) => {
+    if (child instanceof THREE.Mesh && child.material) {
+      const mat = child.material as THREE.MeshStandardMaterial
+      if (mat.emissive && mat.emissive.getHex() !== 0x000000) {
+        mats.push(mat)
+      }
+    }
+  })
+  return mats
 }
 
 // --- Shared types ---
@@ -55,26 +53,15 @@ interface AssetProps {
 const DRONE_URL = '/models/drone-scout.glb'
 
 export function DroneScout({ cyanBoostRef }: AssetProps) {
-  const { scene } = useGLTF(DRONE_URL)
+  const { scene } = useModel(DRONE_URL)
   const groupRef = useRef<THREE.Group>(null)
   const lightRef = useRef<THREE.PointLight>(null)
 
+  // 1 機のみのためインスタンス化しない（InstancedMesh にしてもドローコールは減らない）
   const clonedScene = useMemo(() => scene.clone(), [scene])
+  const emissiveMats = useMemo(() => collectEmissiveMaterials(clonedScene), [clonedScene])
 
-  const emissiveMats = useMemo(() => {
-    const mats: THREE.MeshStandardMaterial[] = []
-    clonedScene.traverse((child) => {
-      if (child instanceof THREE.Mesh && child.material) {
-        const mat = child.material as THREE.MeshStandardMaterial
-        if (mat.emissive && mat.emissive.getHex() !== 0x000000) {
-          mats.push(mat)
-        }
-      }
-    })
-    return mats
-  }, [clonedScene])
-
-  useFrame(({ clock }) => {
+  useProfiledFrame('DroneScout', ({ clock }) => {
     if (!groupRef.current) return
     const t = clock.elapsedTime
     const boost = cyanBoostRef.current
@@ -91,9 +78,7 @@ export function DroneScout({ cyanBoostRef }: AssetProps) {
     groupRef.current.rotation.y = -angle + Math.PI * 0.5
 
     // Emissive
-    emissiveMats.forEach((mat) => {
-      mat.emissiveIntensity = 2.0 * boost
-    })
+    for (const mat of emissiveMats) mat.emissiveIntensity = 2.0 * boost
 
     if (lightRef.current) {
       lightRef.current.intensity = 1.5 * boost
@@ -115,33 +100,29 @@ export function DroneScout({ cyanBoostRef }: AssetProps) {
   )
 }
 
-// --- 2. OrbitalRing: distant background decoration (desktop only) ---
+// --- 2. OrbitalRing: distant background decoration (quality tier: optionalAssets) ---
 
 const RING_URL = '/models/orbital-ring.glb'
 
 export function OrbitalRing({ cyanBoostRef }: AssetProps) {
-  const { scene } = useGLTF(RING_URL)
+  const { scene } = useModel(RING_URL)
   const groupRef = useRef<THREE.Group>(null)
 
   const clonedScene = useMemo(() => scene.clone(), [scene])
 
   const emissiveMats = useMemo(() => {
-    const mats: THREE.MeshStandardMaterial[] = []
     clonedScene.traverse((child) => {
       if (child instanceof THREE.Mesh && child.material) {
-        const mat = child.material as THREE.MeshStandardMaterial
-        if (mat.emissive && mat.emissive.getHex() !== 0x000000) {
-          mats.push(mat)
-        }
         // Make semi-transparent
+        const mat = child.material as THREE.MeshStandardMaterial
         mat.transparent = true
         mat.opacity = 0.6
       }
     })
-    return mats
+    return collectEmissiveMaterials(clonedScene)
   }, [clonedScene])
 
-  useFrame(({ clock }) => {
+  useProfiledFrame('OrbitalRing', ({ clock }) => {
     if (!groupRef.current) return
     const t = clock.elapsedTime
     const boost = cyanBoostRef.current
@@ -150,9 +131,7 @@ export function OrbitalRing({ cyanBoostRef }: AssetProps) {
     groupRef.current.rotation.y = t * 0.02
     groupRef.current.rotation.z = Math.sin(t * 0.01) * 0.1
 
-    emissiveMats.forEach((mat) => {
-      mat.emissiveIntensity = 1.5 * boost
-    })
+    for (const mat of emissiveMats) mat.emissiveIntensity = 1.5 * boost
   })
 
   return (
@@ -180,7 +159,7 @@ const WANDERER_POSITIONS: WandererConfig[] = [
 ]
 
 function SingleWanderer({ config, cyanBoostRef }: { config: WandererConfig; cyanBoostRef: MutableRefObject<number> }) {
-  const { scene, animations } = useGLTF(WANDERER_URL)
+  const { scene, animations } = useModel(WANDERER_URL)
   const groupRef = useRef<THREE.Group>(null)
   const lightRef = useRef<THREE.PointLight>(null)
   const mixerRef = useRef<THREE.AnimationMixer | null>(null)
@@ -207,7 +186,7 @@ function SingleWanderer({ config, cyanBoostRef }: { config: WandererConfig; cyan
     }
   }, [clonedScene, animations, config.phaseOffset])
 
-  useFrame(({ clock }, delta) => {
+  useProfiledFrame('SingleWanderer', ({ clock }, delta) => {
     // Update animation mixer
     mixerRef.current?.update(delta)
 
@@ -267,25 +246,11 @@ interface BirdConfig {
 }
 
 function SingleBird({ config, cyanBoostRef }: { config: BirdConfig; cyanBoostRef: MutableRefObject<number> }) {
-  const { scene } = useGLTF(BIRD_URL)
   const groupRef = useRef<THREE.Group>(null)
+  const params = useRef<ActorParams>({ emissive: 0, opacity: 1 })
+  useActorInstance(BIRD_URL, { object: groupRef, params })
 
-  const clonedScene = useMemo(() => scene.clone(), [scene])
-
-  const emissiveMats = useMemo(() => {
-    const mats: THREE.MeshStandardMaterial[] = []
-    clonedScene.traverse((child) => {
-      if (child instanceof THREE.Mesh && child.material) {
-        const mat = child.material as THREE.MeshStandardMaterial
-        if (mat.emissive && mat.emissive.getHex() !== 0x000000) {
-          mats.push(mat)
-        }
-      }
-    })
-    return mats
-  }, [clonedScene])
-
-  useFrame(({ clock }) => {
+  useProfiledFrame('SingleBird', ({ clock }) => {
     if (!groupRef.current) return
     const t = clock.elapsedTime
     const boost = cyanBoostRef.current
@@ -301,16 +266,10 @@ function SingleBird({ config, cyanBoostRef }: { config: BirdConfig; cyanBoostRef
     groupRef.current.rotation.y = -angle - Math.PI * 0.5
     groupRef.current.rotation.z = Math.sin(t * 4 + phaseOffset) * 0.15
 
-    emissiveMats.forEach((mat) => {
-      mat.emissiveIntensity = 2.0 * boost
-    })
+    params.current.emissive = 2.0 * boost
   })
 
-  return (
-    <group ref={groupRef} scale={0.035}>
-      <primitive object={clonedScene} />
-    </group>
-  )
+  return <group ref={groupRef} scale={0.035} />
 }
 
 const BIRD_CONFIGS: BirdConfig[] = [
@@ -321,21 +280,20 @@ const BIRD_CONFIGS: BirdConfig[] = [
   { orbitRadius: 1.6, orbitSpeed: 0.22, heightBase: 1.0, heightAmp: 0.25, phaseOffset: Math.PI * 1.8 },
 ]
 
-export function MechanicalBirds({ cyanBoostRef, isMobile }: AssetProps & { isMobile: boolean }) {
-  const count = isMobile ? 3 : 5
-  const configs = BIRD_CONFIGS.slice(0, count)
+export function MechanicalBirds({ cyanBoostRef }: AssetProps) {
+  const { birds, modelLod } = useQuality()
+  const configs = BIRD_CONFIGS.slice(0, birds)
 
+  // 群れ全体を 1 つの InstancedActor で描画（ドローコールは羽数に依存しない）
   return (
-    <>
+    <InstancedActor url={BIRD_URL} capacity={BIRD_CONFIGS.length} lod={modelLod}>
       {configs.map((config, i) => (
         <SingleBird key={i} config={config} cyanBoostRef={cyanBoostRef} />
       ))}
-    </>
+    </InstancedActor>
   )
 }
 
-// --- Preload all assets ---
-useGLTF.preload(DRONE_URL)
-useGLTF.preload(RING_URL)
-useGLTF.preload(WANDERER_URL)
-useGLTF.preload(BIRD_URL)
+// --- Idle stage models ---
+// 常時マウントされる装飾アクター（OrbitalRing は ultra ティアのみのためマウント時に読み込む）
+export const DECOR_MODEL_URLS = [DRONE_URL, BIRD_URL]
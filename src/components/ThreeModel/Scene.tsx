@@ -0,0 +1,799 @@
+import React, { useRef, useState, useEffect, Suspense, type RefObject } from "react";
+import * as THREE from "three";
+import { Canvas, useFrame, useThree } from "@react-three/fiber";
+import {
+  OrbitControls,
+  Float,
+  Cloud,
+  Stars,
+} from "@react-three/drei";
+import { EffectComposer, Bloom } from "@react-three/postprocessing";
+import { SkillCrystal, SKILL_CRYSTALS } from './SkillCrystal';
+import { CRYSTAL_MODEL_URLS } from './skillCrystals';
+import { CastleReactions } from './CastleReactions';
+import { DroneScout, OrbitalRing, MechanicalBirds, getScrollCyanBoost, DECOR_MODEL_URLS } from './ScaleAssets';
+import type { WeatherData, WeatherMultipliers } from './weatherTypes';
+import { sceneState, advanceSceneState, setWeatherTarget, WEATHER_AMBIENT, WEATHER_DIR, WEATHER_CYAN } from './sceneState';
+import { createLookupTable, findKeyframe, keyframeFraction, sampleLookupTable } from './lookupTable';
+import { RainParticles } from './WeatherEffects';
+import { useModel, registerRenderer } from './modelAssets';
+import { useStagedLoading, type LoadStage, type StageProgress } from './sceneStages';
+import { QualityProvider, QualityGovernor, useQuality } from './QualityGovernor';
+import { getInitialTier, getPinnedTier } from './qualityTiers';
+import { RenderScheduler, useSceneFrameloop, useFrameBurst } from './RenderScheduler';
+import { useGpuParticles } from './GpuParticles';
+import { RendererStats } from './RendererStats';
+import { FrameProfiler, useProfiledFrame } from './FrameProfiler';
+
+// URL はソースパスで指定し、modelAssets がビルド時マニフェストの最適化済み GLB に解決する
+// （デコーダーは dist/decoders/ にセルフホスト）
+const MODEL_URL = '/models/floating-castle-v6.glb';
+const CRYSTAL_URL = '/models/castle-crystal.glb';
+
+// ====== ライティング基準値（全体の明るさ調整はここ） ======
+// TIME_CONFIG のカーブ形状はそのまま、この乗数で一括スケール
+const AMBIENT_BASE = 5.0;  // 環境光 — 上げると全体が明るく
+const DIR_BASE     = 5.0;  // 太陽光 — 上げると陰影コントラスト強く
+const CYAN_BASE    = 1.0;  // シアン発光 — 上げると夜間グロウ強く
+// ===========================================================
+
+// スクロール時間変化の設定（朝→昼→夕→夜→深夜）
+const TIME_CONFIG = [
+  { at: 0.00, ambient: new THREE.Color('#fff5e0'), intensity: 0.8, dirIntensity: 2.0, cyanIntensity: 3 },
+  { at: 0.25, ambient: new THREE.Color('#ffffff'), intensity: 1.0, dirIntensity: 2.5, cyanIntensity: 3 },
+  { at: 0.50, ambient: new THREE.Color('#ff8c42'), intensity: 0.7, dirIntensity: 1.5, cyanIntensity: 5 },
+  { at: 0.75, ambient: new THREE.Color('#e5e5ff'), intensity: 0.3, dirIntensity: 0.5, cyanIntensity: 8 },
+  { at: 1.00, ambient: new THREE.Color('#ffd500'), intensity: 0.15, dirIntensity: 0.2, cyanIntensity: 12 },
+];
+
+// TIME_CONFIG を [ambient r, g, b, intensity, dirIntensity, cyanIntensity] の LUT に事前計算
+// （毎フレームの区間探索・Color の複製をなくす）
+const TIME_LUT = createLookupTable(6, (t, out) => {
+  const i = findKeyframe(TIME_CONFIG, t);
+  const f = keyframeFraction(TIME_CONFIG, i, t);
+  const lower = TIME_CONFIG[i];
+  const upper = TIME_CONFIG[i + 1];
+  const ambient = lower.ambient.clone().lerp(upper.ambient, f);
+  out[0] = ambient.r;
+  out[1] = ambient.g;
+  out[2] = ambient.b;
+  out[3] = THREE.MathUtils.lerp(lower.intensity, upper.intensity, f);
+  out[4] = THREE.MathUtils.lerp(lower.dirIntensity, upper.dirIntensity, f);
+  out[5] = THREE.MathUtils.lerp(lower.cyanIntensity, upper.cyanIntensity, f);
+});
+const timeSample = new Float32Array(6);
+
+// Story Block 3 で ambient に混ぜるシアン色
+const STORY_TINT = new THREE.Color('#0a2a33');
+
+// マウス追従パララックス
+const MouseParallax = () => {
+  const { camera } = useThree();
+  const mouse = useRef({ x: 0, y: 0 });
+  const basePos = useRef(new THREE.Vector3(0, 0, 10));
+
+  React.useEffect(() => {
+    basePos.current.copy(camera.position);
+    const onMove = (e: MouseEvent) => {
+      // -0.5〜0.5 に正規化
+      mouse.current.x = (e.clientX / window.innerWidth - 0.5);
+      mouse.current.y = (e.clientY / window.innerHeight - 0.5);
+    };
+    window.addEventListener('mousemove', onMove);
+    return () => window.removeEventListener('mousemove', onMove);
+  }, [camera]);
+
+  useProfiledFrame('MouseParallax', () => {
+    if (sceneState.inStory) return;
+    // マウス位置に応じてカメラを微妙にずらす（lerp でなめらかに追従）
+    const targetX = basePos.current.x + mouse.current.x * 0.8;
+    const targetY = basePos.current.y - mouse.current.y * 0.4;
+    camera.position.x += (targetX - camera.position.x) * 0.05;
+    camera.position.y += (targetY - camera.position.y) * 0.05;
+  });
+
+  return null;
+};
+
+// スクロール時間変化 + リアルタイム時間帯 + 天気 + シアン脈動を制御するコンポーネント
+const SceneLighting = ({
+  activeCrystalId,
+  timeLightingEnabled,
+  weatherMultipliers,
+  weatherEnabled,
+}: {
+  activeCrystalId: string | null
+  timeLightingEnabled: boolean
+  weatherMultipliers: WeatherMultipliers | null
+  weatherEnabled: boolean
+}) => {
+  const ambientRef = useRef<THREE.AmbientLight>(null);
+  const dirRef = useRef<THREE.DirectionalLight>(null);
+  const cyanRef = useRef<THREE.PointLight>(null);
+  const requestBurst = useFrameBurst();
+
+  // 天気乗数の目標値（sceneState.weather が ~2s で追従）
+  React.useEffect(() => {
+    setWeatherTarget(weatherEnabled ? weatherMultipliers : null);
+  }, [weatherMultipliers, weatherEnabled]);
+
+  // 天気・時刻・DB boost の lerp（~2s）が demand 中でも最後まで描画されるように
+  React.useEffect(() => {
+    requestBurst(4000);
+  }, [weatherMultipliers, weatherEnabled, timeLightingEnabled, activeCrystalId, requestBurst]);
+
+  // Database active 時のシアン増幅
+  const dbBoostRef = useRef(0);
+
+  useProfiledFrame('SceneLighting', ({ clock }) => {
+    const scrollTime = sampleLookupTable(TIME_LUT, sceneState.scroll, timeSample);
+    const weather = sceneState.weather;
+
+    // DB boost lerp
+    const targetBoost = activeCrystalId === 'database' ? 3.0 : 1.0;
+    dbBoostRef.current += (targetBoost - dbBoostRef.current) * 0.05;
+
+    // 時刻連動ライティングの適用倍率（OFF 時はニュートラル値）
+    const ambientMul = timeLightingEnabled ? sceneState.timeAmbient : 1.0;
+    const cyanMul = timeLightingEnabled ? (0.5 + sceneState.timeCyanBoost * 0.5) : 0.5;
+
+    // 環境光: 基準値 × スクロール時間変化 × リアルタイム時間帯 × 天気
+    if (ambientRef.current) {
+      ambientRef.current.color.setRGB(scrollTime[0], scrollTime[1], scrollTime[2]);
+      ambientRef.current.intensity = AMBIENT_BASE * scrollTime[3] * ambientMul * weather[WEATHER_AMBIENT];
+    }
+
+    // 方向光: 基準値 × スクロール時間変化 × リアルタイム時間帯 × 天気
+    if (dirRef.current) {
+      dirRef.current.intensity = DIR_BASE * scrollTime[4] * ambientMul * weather[WEATHER_DIR];
+    }
+
+    // シアン発光: 基準値 × スクロール時間変化 × リアルタイムcyanBoost × 脈動 × DB boost × 天気
+    if (cyanRef.current) {
+      const pulse = Math.sin(clock.elapsedTime * 1.2) * 0.3 + 1; // 0.7〜1.3
+      cyanRef.current.intensity = CYAN_BASE * scrollTime[5] * cyanMul * pulse * dbBoostRef.current * weather[WEATHER_CYAN];
+    }
+
+    // --- Story エフェクト — 既存ライティングに乗算/加算 ---
+    if (sceneState.inStory) {
+      const block = sceneState.storyBlock;
+      const p = sceneState.storyProgress;
+
+      // Block 1: シアン発光が強まる
+      if (block === 1 && cyanRef.current) {
+        cyanRef.current.intensity *= 1.4;
+      }
+
+      // Block 3: シアン + ambient にシアン色味
+      if (block === 3) {
+        if (cyanRef.current) cyanRef.current.intensity *= 1.3;
+        if (ambientRef.current) {
+          ambientRef.current.color.lerp(STORY_TINT, 0.03);
+        }
+      }
+
+      // Block 4: 全体発光バースト
+      if (block === 4 && cyanRef.current) {
+        const burstPhase = Math.sin(p * Math.PI * 3) * 0.5 + 0.5;
+        cyanRef.current.intensity += burstPhase * 3;
+      }
+    }
+  });
+
+  return (
+    <>
+      <ambientLight ref={ambientRef} intensity={1.5} color="#e8f4ff" />
+      <directionalLight ref={dirRef} position={[5, 8, 3]} intensity={2} color="#ffffff" />
+      <pointLight
+        ref={cyanRef}
+        position={[0, -0.55, 0]}
+        color="#00e5ff"
+        intensity={3}
+        distance={3}
+        decay={2}
+      />
+    </>
+  );
+};
+
+// 星空背景（夜になると浮かび上がる）
+const NightSky = () => {
+  const starsRef = useRef<THREE.Group>(null);
+  const { stars } = useQuality();
+
+  // visible で確実に表示/非表示を制御
+  useProfiledFrame('NightSky', () => {
+    if (!starsRef.current) return;
+    starsRef.current.visible = sceneState.scroll > 0.4;
+  });
+
+  return (
+    <group ref={starsRef} visible={false}>
+      <Stars
+        radius={50}
+        depth={30}
+        count={stars}
+        factor={3}
+        saturation={0.2}
+        fade
+        speed={0.5}
+      />
+    </group>
+  );
+};
+
+// 城の塔上に配置するクリスタル（スクロール連動発光 + 回転 + 浮遊）
+const CastleCrystals = () => {
+  const { scene } = useModel(CRYSTAL_URL);
+  const ref1 = useRef<THREE.Group>(null);
+  const ref2 = useRef<THREE.Group>(null);
+
+  const clone1 = React.useMemo(() => scene.clone(true), [scene]);
+  const clone2 = React.useMemo(() => scene.clone(true), [scene]);
+
+  // 発光を更新するマテリアル（毎フレームの traverse をなくすため事前に収集）
+  const emissiveMaterials = React.useMemo(() => {
+    const found = new Set<THREE.MeshStandardMaterial>();
+    for (const root of [clone1, clone2]) {
+      root.traverse((child) => {
+        const mat = (child as THREE.Mesh).material as THREE.MeshStandardMaterial | undefined;
+        if ((child as THREE.Mesh).isMesh && mat?.emissive) found.add(mat);
+      });
+    }
+    return [...found];
+  }, [clone1, clone2]);
+
+  // GLB 内ジオメトリのバウンディングボックス中心（焼き込み座標）
+  // 回転軸を自身の中心にするため、primitive にオフセットを掛けて原点にセンタリング
+  const GEO_OFFSET: [number, number, number] = [0.713, -0.293, -0.019];
+
+  // 配置位置（R3F 座標系）— 目視で微調整可
+  const POSITIONS: [number, number, number][] = [
+    [-0.74, 0.14, 0.04],  // 左塔 x , y , z
+    [0.738, 0.12, 0.02],   // 右塔
+  ];
+
+  useProfiledFrame('CastleCrystals', ({ clock }) => {
+    const t = clock.elapsedTime;
+
+    // スクロール連動 emissive: 1.5（朝・常時グロウ）→ 3.5（深夜・強烈）
+    const scrollBase = 1.5 + sceneState.scroll * 2.0;
+    // 脈動（シアン pointLight と同リズム）
+    const pulse = Math.sin(t * 1.2) * 0.3 + 1;
+    const emissiveIntensity = scrollBase * pulse;
+
+    // マテリアルの emissiveIntensity を更新
+    for (let i = 0; i < emissiveMaterials.length; i++) {
+      emissiveMaterials[i].emissiveIntensity = emissiveIntensity;
+    }
+
+    for (let i = 0; i < 2; i++) {
+      const group = i === 0 ? ref1.current : ref2.current;
+      if (!group) continue;
+      // ゆっくり回転
+      group.rotation.y += 0.005;
+      // 浮遊（2つ目はフェーズをずらす）
+      const phaseOffset = i * 1.5;
+      group.position.y = POSITIONS[i][1] + Math.sin((t + phaseOffset) * 0.8) * 0.003;
+    }
+  });
+
+  return (
+    <>
+      <group ref={ref1} position={POSITIONS[0]} scale={1.8}>
+        <primitive object={clone1} position={GEO_OFFSET} />
+      </group>
+      <group ref={ref2} position={POSITIONS[1]} scale={1.8}>
+        <primitive object={clone2} position={GEO_OFFSET} />
+      </group>
+    </>
+  );
+};
+
+// Mat_Crystal の発光色（GLB 元のシアン）
+const CRYSTAL_EMISSIVE = new THREE.Color('#00e5ff');
+// スクロール 0〜1 で城が回転する角度
+const MODEL_ROTATION_RANGE = Math.PI * 0.8;
+
+const Model = ({
+  activeCrystalId,
+  onActivateCrystal,
+  cyanBoostRef,
+  showCrystals,
+}: {
+  activeCrystalId: string | null
+  onActivateCrystal: (id: string | null) => void
+  cyanBoostRef: React.MutableRefObject<number>
+  /** 結晶ステージのロード完了後に true */
+  showCrystals: boolean
+}) => {
+  const group = useRef<THREE.Group>(null);
+  const innerGroupRef = useRef<THREE.Group>(null);
+  const { nodes, materials } = useModel(MODEL_URL) as any;
+
+  // emissive リセット（Mat_Cyan_Glow / Mat_Crystal は発光を維持するためスキップ）
+  React.useEffect(() => {
+    Object.values(materials).forEach((mat) => {
+      const m = mat as THREE.MeshStandardMaterial;
+      if (m.name === 'Mat_Cyan_Glow' || m.name === 'Mat_Crystal') return;
+      m.emissive.set('#000000');
+      m.emissiveIntensity = 0;
+      m.needsUpdate = true;
+    });
+  }, [materials]);
+
+  // Mat_Cyan_Glow の脈動（SceneLighting のシアン脈動と同じリズム）
+  const glowMatRef = useRef<THREE.MeshStandardMaterial | null>(null);
+  // Mat_Crystal のスクロール連動発光
+  const crystalMatRef = useRef<THREE.MeshStandardMaterial | null>(null);
+  React.useEffect(() => {
+    const glowMat = Object.values(materials).find(
+      (m) => (m as THREE.MeshStandardMaterial).name === 'Mat_Cyan_Glow'
+    ) as THREE.MeshStandardMaterial | undefined;
+    glowMatRef.current = glowMat ?? null;
+
+    const crystalMat = Object.values(materials).find(
+      (m) => (m as THREE.MeshStandardMaterial).name === 'Mat_Crystal'
+    ) as THREE.MeshStandardMaterial | undefined;
+    crystalMatRef.current = crystalMat ?? null;
+  }, [materials]);
+
+  useProfiledFrame('Model', ({ clock }) => {
+    const scroll = sceneState.scroll;
+
+    // スクロールで城全体を回転（0 → 0.8π）
+    if (group.current) group.current.rotation.y = scroll * MODEL_ROTATION_RANGE;
+
+    const pulse = Math.sin(clock.elapsedTime * 1.2) * 0.3 + 1; // 0.7〜1.3
+
+    // Mat_Cyan_Glow: emissiveIntensity を 0.3〜0.8 でゆらす
+    if (glowMatRef.current) {
+      glowMatRef.current.emissiveIntensity = 0.3 + pulse * 0.25;
+    }
+
+    // --- Mat_Crystal: スクロール位置 × 加速度 × 時間帯 で発光制御 ---
+    if (crystalMatRef.current) {
+      // 1) emissive色をGLB元のシアンに復帰
+      crystalMatRef.current.emissive.copy(CRYSTAL_EMISSIVE);
+
+      // 2) スクロール位置ベース（朝 0.3 → 深夜 3.0）
+      const scrollBase = 0.3 + scroll * 2.7;
+
+      // 3) スクロール加速度ブースト（速く動かすほど光が増す / 速度は sceneState で平滑化済み）
+      const velocity = sceneState.scrollVelocity;
+      const velocityBoost = 1.0 + Math.min(velocity * 4, 5.0); // 1.0〜6.0
+
+      // 4) 時間帯倍率（朝 0.6x → 夜 1.5x）
+      const timeMul = 0.6 + sceneState.timeCyanBoost * 0.9;
+
+      // 5) 脈動（速度が高いほど脈動も速くなる）
+      const pulseSpeed = 1.2 + velocity * 3;
+      const crystalPulse = Math.sin(clock.elapsedTime * pulseSpeed) * 0.3 + 1;
+
+      // 最終: scrollBase × velocityBoost × timeMul × pulse
+      crystalMatRef.current.emissiveIntensity = scrollBase * velocityBoost * timeMul * crystalPulse;
+    }
+  });
+
+  return (
+    <group ref={group}>
+      <group ref={innerGroupRef} position={[0, -0.2, 0]}>
+        {/* 城＋岩盤（Mesh_0 一体構造） */}
+        <primitive object={nodes.Mesh_0} />
+        {/* 塔上クリスタル（スクロール連動発光） */}
+        <CastleCrystals />
+        {/* 城リアクション */}
+        <CastleReactions
+          activeCrystalId={activeCrystalId}
+          innerGroupRef={innerGroupRef}
+        />
+        {/* スキルの結晶（結晶ステージ完了後にマウント） */}
+        {showCrystals && (
+          <Suspense fallback={null}>
+            {SKILL_CRYSTALS.map((crystal, i) => (
+              <SkillCrystal
+                key={crystal.id}
+                index={i}
+                id={crystal.id}
+                model={crystal.model}
+                orbit={crystal.orbit}
+                title={crystal.title}
+                emissiveBase={crystal.emissiveBase}
+                lightColor={crystal.lightColor}
+                isActive={activeCrystalId === crystal.id}
+                anyActive={activeCrystalId !== null}
+                onActivate={onActivateCrystal}
+              />
+            ))}
+          </Suspense>
+        )}
+      </group>
+    </group>
+  );
+};
+
+// --- Bloom 除外レイヤー ---
+// レイヤー11 のオブジェクトはブルームパスに含まれず、別パスで描画される
+const BLOOM_EXCLUDE_LAYER = 11;
+
+const setBloomExcludeLayer = (obj: THREE.Object3D) => obj.layers.set(BLOOM_EXCLUDE_LAYER);
+
+// 子要素をレイヤー11 に移してブルーム対象から除外するラッパー
+const BloomExcluded = ({ children }: { children: React.ReactNode }) => {
+  const groupRef = useRef<THREE.Group>(null);
+  useProfiledFrame('BloomExcluded', () => {
+    if (!groupRef.current) return;
+    groupRef.current.traverse(setBloomExcludeLayer);
+  });
+  return <group ref={groupRef}>{children}</group>;
+};
+
+// ブルーム後にレイヤー11 を手動描画するコンポーネント
+const AfterBloomRenderer = () => {
+  const { gl, scene, camera } = useThree();
+  useProfiledFrame('AfterBloomRenderer', () => {
+    const savedMask = camera.layers.mask;
+    camera.layers.set(BLOOM_EXCLUDE_LAYER);
+    gl.autoClear = false;
+    gl.clear(false, true, false); // depth のみクリア
+    gl.render(scene, camera);
+    camera.layers.mask = savedMask;
+    gl.autoClear = true;
+  }, 2); // priority 2: EffectComposer（priority 1）の後に実行
+  return null;
+};
+
+// Bloom OFF 時の通常描画（priority 1 — EffectComposer の代わり）
+// AfterBloomRenderer が priority 2 で動くため、R3F の自動描画は止まっている
+const DirectRenderer = () => {
+  const { gl, scene, camera } = useThree();
+  useFrame(() => {
+    gl.render(scene, camera);
+  }, 1);
+  return null;
+};
+
+// 画質ティアに応じて Bloom の有無・解像度を切り替え
+const PostProcessing = () => {
+  const { bloom, bloomResolutionScale } = useQuality();
+  if (!bloom) return <DirectRenderer />;
+  return (
+    <EffectComposer key={bloomResolutionScale} multisampling={0}>
+      <Bloom
+        intensity={2.0}
+        luminanceThreshold={1.5}
+        luminanceSmoothing={0.2}
+        mipmapBlur
+        resolutionScale={bloomResolutionScale}
+      />
+    </EffectComposer>
+  );
+};
+
+// 霧・モヤ演出（ラピュタ風）— 天気に応じて不透明度・色を変化、画質ティアで segments を調整
+const WeatherClouds = ({ weather, weatherEnabled }: { weather: WeatherData | null; weatherEnabled: boolean }) => {
+  const { cloudDetail, extraCloud } = useQuality();
+  const boost = (weatherEnabled && weather) ? weather.multipliers.cloudOpacityBoost : 0;
+  const isRainy = weatherEnabled && weather && (weather.category === 'rain' || weather.category === 'thunderstorm');
+  const cloudColor = isRainy ? '#8aafcc' : '#b0e8ff';
+  const segments = (n: number) => Math.max(1, Math.round(n * cloudDetail));
+  return (
+    <>
+      <Cloud
+        key={`c1-${isRainy}-${cloudDetail}`}
+        position={[0, -0.5, 0]}
+        opacity={0.05 + boost}
+        speed={0.2}
+        bounds={[4, 1, 1.5]}
+        segments={segments(5)}
+        color={cloudColor}
+      />
+      <Cloud
+        key={`c2-${isRainy}-${cloudDetail}`}
+        position={[1, 0.3, -1]}
+        opacity={0.05 + boost}
+        speed={0.15}
+        bounds={[3, 1, 1]}
+        segments={segments(3)}
+        color={isRainy ? '#7a9bb8' : '#e0f0ff'}
+      />
+      {/* Extra cloud layer for overcast / rain */}
+      {extraCloud && boost > 0.05 && (
+        <Cloud
+          key={`c3-${isRainy}-${cloudDetail}`}
+          position={[-1, 0.6, 0.5]}
+          opacity={boost * 0.8}
+          speed={0.1}
+          bounds={[3.5, 0.8, 1.2]}
+          segments={segments(4)}
+          color={cloudColor}
+        />
+      )}
+    </>
+  );
+};
+
+// スクロール速度連動パーティクル（drei Sparkles 相当の動きを GPU パーティクルで再現）
+// 10 units 立方に分布し、speed 0.4 で揺らぐ
+const SPARKLE_MOTION = /* glsl */ `
+  vec3 particlePosition(vec3 s, vec4 r, inout float alpha) {
+    vec3 p = (s - 0.5) * 10.0;
+    float phase = uTime * 0.4 + p.x * 100.0;
+    p.y += sin(phase) * 0.2;
+    p.z += cos(phase) * 0.2;
+    p.x += cos(phase) * 0.2;
+    alpha = 0.5;
+    return p;
+  }
+`;
+
+const ScrollSparkles = () => {
+  const { sparkles } = useQuality();
+  const { points, uniforms } = useGpuParticles({
+    maxCount: sparkles,
+    motion: SPARKLE_MOTION,
+    color: '#00e5ff',
+    size: 6,
+    shape: 'glow',
+    sizeMode: 'pixel',
+    blending: THREE.NormalBlending,
+  });
+
+  useProfiledFrame('ScrollSparkles', (_, delta) => {
+    uniforms.uTime.value += delta;
+    // 静止時は従来の drei Sparkles と同じ見た目（alpha 0.5 × 1.0）。
+    // スクロール速度（sceneState で平滑化済み）に応じて上乗せし、高速スクロール時は ×2（alpha 1.0）まで
+    uniforms.uOpacity.value = 1.0 + Math.min(1.0, sceneState.scrollVelocity * 3);
+  });
+
+  return <primitive object={points} />;
+};
+
+// 遠景装飾（画質ティアが optionalAssets を許可する場合のみマウント）
+const OptionalAssets = ({ cyanBoostRef }: { cyanBoostRef: React.MutableRefObject<number> }) => {
+  const { optionalAssets } = useQuality();
+  if (!optionalAssets) return null;
+  return (
+    <Suspense fallback={null}>
+      <OrbitalRing cyanBoostRef={cyanBoostRef} />
+    </Suspense>
+  );
+};
+
+// cyanBoostRef をスクロール進行度に連動させるドライバー
+const CyanBoostDriver = ({ cyanBoostRef }: { cyanBoostRef: React.MutableRefObject<number> }) => {
+  useProfiledFrame('CyanBoostDriver', () => {
+    cyanBoostRef.current = getScrollCyanBoost(sceneState.scroll);
+  });
+
+  return null;
+};
+
+// カメラ reveal 演出（パン & ズーム）
+const CAMERA_START = new THREE.Vector3(3, 4, 16);
+const CAMERA_END = new THREE.Vector3(0, 0.5, 3);
+
+const CameraReveal = ({ phase }: { phase: ScenePhase }) => {
+  const { camera } = useThree();
+  const startedRef = useRef(false);
+  const doneRef = useRef(false);
+  const tmpVec = useRef(new THREE.Vector3());
+
+  // Set camera to start position on mount
+  useEffect(() => {
+    camera.position.copy(CAMERA_START);
+    camera.lookAt(0, 0, 0);
+  }, [camera]);
+
+  useProfiledFrame('CameraReveal', () => {
+    if (doneRef.current) return;
+
+    if (phase === 'loading') {
+      // Hold at start position with subtle drift
+      camera.position.copy(CAMERA_START);
+      camera.lookAt(0, 0, 0);
+      return;
+    }
+
+    if (phase === 'fog' || phase === 'ready') {
+      if (!startedRef.current) {
+        startedRef.current = true;
+      }
+
+      // Smooth lerp toward final position
+      tmpVec.current.copy(CAMERA_END);
+      camera.position.lerp(tmpVec.current, 0.025);
+      camera.lookAt(0, 0, 0);
+
+      // Check if close enough to hand off to OrbitControls
+      const dist = camera.position.distanceTo(CAMERA_END);
+      if (dist < 0.05) {
+        camera.position.copy(CAMERA_END);
+        doneRef.current = true;
+      }
+    }
+  });
+
+  return null;
+};
+
+// OrbitControls の有効/無効を useFrame で ref 制御
+const OrbitControlsManager = ({ phase }: { phase: ScenePhase }) => {
+  const controlsRef = useRef<any>(null);
+
+  useProfiledFrame('OrbitControlsManager', () => {
+    if (!controlsRef.current) return;
+    controlsRef.current.enabled = phase === 'ready' && !sceneState.inStory;
+    if (controlsRef.current.enabled) {
+      controlsRef.current.update();
+    }
+  });
+
+  return (
+    <OrbitControls
+      ref={controlsRef}
+      enableZoom={true}
+      minDistance={3}
+      maxDistance={3}
+      enabled={false}
+    />
+  );
+};
+
+// Story 区間のカメラパス制御
+const StoryCamera = () => {
+  const { camera } = useThree();
+
+  const STORY_CAMERA_PATH = React.useMemo(() => new THREE.CatmullRomCurve3([
+    new THREE.Vector3(0, 0.5, 3),       // 正面（CameraReveal の到達点）
+    new THREE.Vector3(2.2, 0.2, 1.8),   // 右前方
+    new THREE.Vector3(2.5, -0.1, -0.5), // 右側面やや下
+    new THREE.Vector3(0.5, 0.3, -2.2),  // 背面
+    new THREE.Vector3(-1.8, 1.0, -0.8), // 左後方（見上げ）
+    new THREE.Vector3(-2.0, 0.6, 1.2),  // 左前方
+    new THREE.Vector3(0, 0.5, 3),       // 正面に戻る
+  ], false, 'catmullrom', 0.5), []);
+
+  const CAMERA_TARGET = React.useMemo(() => new THREE.Vector3(0, -0.2, 0), []);
+  const tmpPos = React.useRef(new THREE.Vector3());
+
+  useProfiledFrame('StoryCamera', () => {
+    if (!sceneState.inStory) return;
+
+    STORY_CAMERA_PATH.getPointAt(sceneState.storyProgress, tmpPos.current);
+    camera.position.lerp(tmpPos.current, 0.08);
+    camera.lookAt(CAMERA_TARGET);
+  });
+
+  return null;
+};
+
+// sceneState の平滑化（スクロール速度・天気乗数）を 1 フレーム 1 回、他の useFrame より先に実行
+const SceneStateDriver = () => {
+  useProfiledFrame('SceneState', advanceSceneState, -1);
+  return null;
+};
+
+// --- 段階ロード ---
+// 城 + ライティング（ローディング演出の対象）→ スキルクリスタル → アイドル時に装飾アクター
+const LOAD_STAGES: LoadStage[] = [
+  { id: 'castle', label: 'CASTLE', models: [MODEL_URL, CRYSTAL_URL] },
+  { id: 'crystals', label: 'CRYSTALS', models: CRYSTAL_MODEL_URLS },
+  { id: 'actors', label: 'ACTORS', models: DECOR_MODEL_URLS, idle: true },
+];
+
+export type ScenePhase = 'loading' | 'fog' | 'ready';
+
+export interface SceneCanvasProps {
+  phase: ScenePhase
+  /** Canvas のコンテナ（画面外判定用） */
+  containerRef: RefObject<HTMLElement>
+  activeCrystalId: string | null
+  onActivateCrystal: (id: string | null) => void
+  timeLightingEnabled: boolean
+  weather: WeatherData | null
+  weatherEnabled: boolean
+  onStageProgress: (stages: StageProgress[]) => void
+}
+
+// ThreeScene（index.tsx）から動的 import される 3D 本体
+export default function SceneCanvas({
+  phase,
+  containerRef,
+  activeCrystalId,
+  onActivateCrystal,
+  timeLightingEnabled,
+  weather,
+  weatherEnabled,
+  onStageProgress,
+}: SceneCanvasProps) {
+  const cyanBoostRef = useRef(0.3);
+  // 画質ティア（QualityGovernor が実測フレーム時間で上下させる）
+  const [qualityTier, setQualityTier] = useState(getInitialTier);
+  // 画面外・タブ非表示・本文閲覧中は demand 描画（reveal 完了までは常時描画）
+  const frameloop = useSceneFrameloop(containerRef, phase !== 'ready');
+  const { ready: stagesReady, progress: stageProgress } = useStagedLoading(LOAD_STAGES);
+
+  useEffect(() => {
+    onStageProgress(stageProgress);
+  }, [stageProgress, onStageProgress]);
+
+  return (
+    <Canvas
+      frameloop={frameloop}
+      camera={{ position: [3, 4, 16], fov: 45 }}
+      gl={{
+        toneMapping: THREE.ACESFilmicToneMapping,
+        outputColorSpace: THREE.SRGBColorSpace,
+      }}
+      onCreated={({ gl }) => registerRenderer(gl)}
+      onPointerMissed={() => onActivateCrystal(null)}
+    >
+      <RenderScheduler frameloop={frameloop}>
+      <QualityProvider tier={qualityTier}>
+      {/* 画質ティア制御（reveal 完了後・常時描画中のみフレーム時間を計測 / ?quality= 指定時は固定） */}
+      <QualityGovernor active={phase === 'ready' && frameloop === 'always' && getPinnedTier() === null} tier={qualityTier} onChangeTier={setQualityTier} />
+      {/* renderer.info のフレーム単位集計（ドローコール・プログラム数の確認用） */}
+      <RendererStats />
+      {/* useFrame ごとの CPU 時間計測（dev / ?profile のみ。ProfilerHud・ベンチマークが参照） */}
+      <FrameProfiler />
+      {/* スクロール速度・天気乗数の平滑化（sceneState.ts） */}
+      <SceneStateDriver />
+      {/* ライティング（時間変化 + シアン脈動 + DB boost） */}
+      <SceneLighting activeCrystalId={activeCrystalId} timeLightingEnabled={timeLightingEnabled} weatherMultipliers={weather?.multipliers ?? null} weatherEnabled={weatherEnabled} />
+      {/* 星空背景（夜に浮かび上がる） */}
+      <NightSky />
+      {/* カメラ reveal 演出（ローディング後にパン＆ズーム） */}
+      <CameraReveal phase={phase} />
+      {/* マウス追従パララックス（reveal 完了後のみ動作） */}
+      {phase === 'ready' && <MouseParallax />}
+      {/* Story 区間のカメラパス制御 */}
+      {phase === 'ready' && <StoryCamera />}
+      {/* 霧・モヤ演出（ラピュタ風）— 天気に応じて不透明度・色を変化 */}
+      <WeatherClouds weather={weather} weatherEnabled={weatherEnabled} />
+      {/* パーティクル（スクロール速度連動・ブルーム除外） */}
+      <BloomExcluded>
+        <ScrollSparkles />
+      </BloomExcluded>
+      {/* 雨パーティクル（天気連動・ブルーム除外） */}
+      {weatherEnabled && weather && weather.multipliers.rainIntensity > 0 && (
+        <BloomExcluded>
+          <RainParticles intensity={weather.multipliers.rainIntensity} windSpeed={weather.windSpeed} />
+        </BloomExcluded>
+      )}
+      <AfterBloomRenderer />
+      <Float
+        speed={1}
+        rotationIntensity={0.5}
+        floatIntensity={0.5}
+        floatingRange={[-0.1, 0.5]}
+      >
+        <Model
+          activeCrystalId={activeCrystalId}
+          onActivateCrystal={onActivateCrystal}
+          cyanBoostRef={cyanBoostRef}
+          showCrystals={stagesReady >= 2}
+        />
+      </Float>
+      {/* スケール感演出アセット */}
+      <CyanBoostDriver cyanBoostRef={cyanBoostRef} />
+      {/* 装飾アクター（アイドル時に読み込むステージ） */}
+      {stagesReady >= 3 && (
+        <>
+          <Suspense fallback={null}>
+            <DroneScout cyanBoostRef={cyanBoostRef} />
+          </Suspense>
+          <OptionalAssets cyanBoostRef={cyanBoostRef} />
+          <Suspense fallback={null}>
+            <MechanicalBirds cyanBoostRef={cyanBoostRef} />
+          </Suspense>
+        </>
+      )}
+      <OrbitControlsManager phase={phase} />
+      {/* ポストプロセス: Bloom（クリスタル等の高輝度オブジェクトのみグロウ / low ティアは無効） */}
+      <PostProcessing />
+      </QualityProvider>
+      </RenderScheduler>
+    </Canvas>
+  );
+}
@@ -1,32 +1,13 @@
-import React, { useRef, useMemo } from 'react'
-import { useFrame } from '@react-three/fiber'
-import { useGLTF, Html } from '@react-three/drei'
+import { useRef, useMemo } from 'react'
+import { Html } from '@react-three/drei'
 import * as THREE from 'three'
+import { useModelAtLod } from './modelAssets'
 import styl from './index.module.styl'
-
-import skillsData from '@/data/skills.json'
-import type { SkillEntry, OrbitParams } from '@/data/skillTypes'
-export type { OrbitParams }
-
-// --- Data ---
-
-// 全クリスタル共通の公転速度（等間隔を維持するため統一）
-export const SHARED_ORBIT_SPEED = 0.10 // rad/s
-
-export const SKILL_CRYSTALS = (skillsData as SkillEntry[])
-  .filter(s => s.crystal !== null)
-  .map(s => ({
-    id: s.id,
-    model: s.crystal!.model,
-    orbit: s.crystal!.orbit,
-    title: s.title,
-    description: s.description,
-    tags: s.skillTags,
-    emissiveBase: s.crystal!.emissiveBase,
-    lightColor: s.crystal!.lightColor,
-  }))
-
-export type SkillCrystalData = (typeof SKILL_CRYSTALS)[number]
+import { SKILL_CRYSTALS, SHARED_ORBIT_SPEED, type OrbitParams } from './skillCrystals'
+import { sceneState } from './sceneState'
+import { useProfiledFrame } from './FrameProfiler'
+import { useQuality } from './QualityGovernor'
+export { SKILL_CRYSTALS, SHARED_ORBIT_SPEED, type SkillCrystalData, type OrbitParams } from './skillCrystals'
 
 // --- Component ---
 
@@ -41,14 +22,12 @@ interface SkillCrystalProps {
   isActive: boolean
   anyActive: boolean // いずれかのクリスタルがアクティブ→全体減速
   onActivate: (id: string | null) => void
-  storyActiveBlockRef?: React.MutableRefObject<number>
 }
 
 export function SkillCrystal({
   id, model, orbit, title, emissiveBase, lightColor,
-  index, isActive, anyActive, onActivate, storyActiveBlockRef,
+  index, isActive, anyActive, onActivate,
 }: SkillCrystalProps) {
-  const { scene } = useGLTF(model)
   const meshRef = useRef<THREE.Group>(null)
   const pointLightRef = useRef<THREE.PointLight>(null)
   // 等間隔: index × (360°/N) で初期位相を設定
@@ -56,6 +35,9 @@ export function SkillCrystal({
   const angleRef = useRef(index * (2 * Math.PI / N))
   const velocityRef = useRef(SHARED_ORBIT_SPEED)
 
+  // 結晶ごとに別モデルのため、インスタンス化せず複製して描画する（LOD は画質ティアに追従）
+  const { modelLod } = useQuality()
+  const { scene } = useModelAtLod(model, modelLod)
   const clonedScene = useMemo(() => scene.clone(), [scene])
 
   const emissiveMats = useMemo(() => {
@@ -82,6 +64,7 @@ export function SkillCrystal({
         }
       }
     })
+
     return mats
   }, [clonedScene, id])
 
@@ -89,7 +72,7 @@ export function SkillCrystal({
   const tiltRad = useMemo(() => orbit.tilt * (Math.PI / 180), [orbit.tilt])
   const tiltDirRad = useMemo(() => orbit.tiltDir * (Math.PI / 180), [orbit.tiltDir])
 
-  useFrame(({ clock }) => {
+  useProfiledFrame('SkillCrystal', ({ clock }) => {
     if (!meshRef.current) return
     const t = clock.elapsedTime
 
@@ -126,11 +109,9 @@ export function SkillCrystal({
 
     // 脈動する発光（振幅拡大）
     const pulse = emissiveBase + Math.sin(t * 1.5 + index * 1.8) * 0.8
-    const storyBoost = storyActiveBlockRef?.current === 2 ? 2.0 : 1.0
+    const storyBoost = sceneState.storyBlock === 2 ? 2.0 : 1.0
     const intensity = (isActive ? pulse * 2.0 : pulse) * storyBoost
-    emissiveMats.forEach((mat) => {
-      mat.emissiveIntensity = intensity
-    })
+    for (const mat of emissiveMats) mat.emissiveIntensity = intensity
 
     // pointLight も連動
     if (pointLightRef.current) {
@@ -185,6 +166,3 @@ export function SkillCrystal({
     </group>
   )
 }
-
-// 全結晶を事前ロード
-SKILL_CRYSTALS.forEach((c) => useGLTF.preload(c.model))
@@ -0,0 +1,65 @@
+// --- キーフレームカーブのルックアップテーブル ---
+// { at, ... } のキーフレーム配列（TIME_CONFIG / CYAN_BOOST_CONFIG 等）を起動時に Float32Array へ
+// 事前サンプリングし、毎フレームの区間探索・中間オブジェクトの生成をなくす。
+// 読み出しは隣接サンプル間の線形補間（256 サンプルなら元の区分線形カーブとの差は誤差レベル）。
+
+export interface LookupTable {
+  /** サンプル数 */
+  size: number
+  /** 1 サンプルあたりの値の数 */
+  channels: number
+  data: Float32Array
+}
+
+const DEFAULT_SIZE = 256
+
+/** at 昇順のキーフレームで t を含む区間 [i, i + 1] の i（範囲外は先頭区間） */
+export function findKeyframe(keys: readonly { at: number }[], t: number): number {
+  for (let i = 0; i < keys.length - 1; i++) {
+    if (t >= keys[i].at && t <= keys[i + 1].at) return i
+  }
+  return 0
+}
+
+/** 区間 [i, i + 1] 内での t の位置（0〜1） */
+export function keyframeFraction(keys: readonly { at: number }[], i: number, t: number): number {
+  const range = keys[i + 1].at - keys[i].at || 1
+  return (t - keys[i].at) / range
+}
+
+/** fill(t, out) で t（0〜1）の値を out に書き込み、size 個サンプリングする */
+export function createLookupTable(
+  channels: number,
+  fill: (t: number, out: Float32Array) => void,
+  size = DEFAULT_SIZE,
+): LookupTable {
+  const data = new Float32Array(size * channels)
+  for (let i = 0; i < size; i++) {
+    fill(i / (size - 1), data.subarray(i * channels, (i + 1) * channels))
+  }
+  return { size, channels, data }
+}
+
+/** t（0〜1 にクランプ）の全チャンネルを out に書き込む */
+export function sampleLookupTable(lut: LookupTable, t: number, out: Float32Array): Float32Array {
+  const { size, channels, data } = lut
+  const x = (t <= 0 ? 0 : t >= 1 ? 1 : t) * (size - 1)
+  const i = Math.min(size - 2, Math.floor(x))
+  const f = x - i
+  const a = i * channels
+  const b = a + channels
+  for (let c = 0; c < channels; c++) {
+    out[c] = data[a + c] + (data[b + c] - data[a + c]) * f
+  }
+  return out
+}
+
+/** 1 チャンネル目の値だけを返す */
+export function sampleLookupTable1(lut: LookupTable, t: number): number {
+  const { size, channels, data } = lut
+  const x = (t <= 0 ? 0 : t >= 1 ? 1 : t) * (size - 1)
+  const i = Math.min(size - 2, Math.floor(x))
+  const f = x - i
+  const a = data[i * channels]
+  return a + (data[(i + 1) * channels] - a) * f
+}
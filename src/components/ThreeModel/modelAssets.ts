@@ -0,0 +1,212 @@
+import { useEffect, useState } from 'react'
+import { useThree } from '@react-three/fiber'
+import { GLTFLoader, type GLTF } from 'three/examples/jsm/loaders/GLTFLoader.js'
+import { DRACOLoader } from 'three/examples/jsm/loaders/DRACOLoader.js'
+import { KTX2Loader } from 'three/examples/jsm/loaders/KTX2Loader.js'
+import { MeshoptDecoder } from 'three/examples/jsm/libs/meshopt_decoder.module.js'
+import type * as THREE from 'three'
+import manifest from 'virtual:model-manifest'
+
+// --- GLB アセットの URL 解決・ロード・進捗 ---
+// ビルド時は integrations/optimize-models.mjs が最適化済み GLB（meshopt + KTX2 + LOD）と
+// セルフホストのデコーダーを出力し、マニフェスト経由で URL を差し替える。
+// dev では元の /models/*.glb がそのまま返る。
+//
+// ダウンロードは fetch のストリームで行い、バイト単位の進捗を公開する
+// （ロード段階ごとの進捗表示用。drei の useProgress はファイル数単位のため使わない）。
+
+export const DRACO_DECODER_PATH = manifest.decoders.draco
+
+/** Source path (/models/*.glb) → served URL for the given LOD (0 = full detail) */
+export function modelUrl(src: string, lod = 0): string {
+  const entry = manifest.models[src]
+  if (!entry) return src
+  return entry.lods[Math.min(lod, entry.lods.length - 1)]
+}
+
+export type ModelAsset = GLTF & {
+  nodes: Record<string, THREE.Object3D>
+  materials: Record<string, THREE.Material>
+}
+
+const dracoLoader = new DRACOLoader().setDecoderPath(DRACO_DECODER_PATH)
+const ktx2Loader = new KTX2Loader().setTranscoderPath(manifest.decoders.basis)
+const gltfLoader = new GLTFLoader()
+  .setDRACOLoader(dracoLoader)
+  .setKTX2Loader(ktx2Loader)
+  .setMeshoptDecoder(MeshoptDecoder)
+
+// KTX2 トランスコーダーはレンダラーの対応フォーマット判定が必要なため、
+// ダウンロードは先行させ、パースは Canvas 生成まで待つ
+let rendererRegistered = false
+let resolveRenderer: () => void = () => {}
+const rendererReady = new Promise<void>((resolve) => { resolveRenderer = resolve })
+
+/** Canvas の onCreated から呼ぶ（KTX2 サポート判定 + 保留中のパースを再開） */
+export function registerRenderer(gl: THREE.WebGLRenderer) {
+  if (rendererRegistered) return
+  ktx2Loader.detectSupport(gl)
+  rendererRegistered = true
+  resolveRenderer()
+}
+
+// --- Load cache (Suspense 対応) ---
+
+interface ModelEntry {
+  promise: Promise<ModelAsset>
+  asset?: ModelAsset
+  loaded: number
+  /** 期待バイト数（Content-Length → マニフェスト → 不明なら 0） */
+  total: number
+}
+
+const entries = new Map<string, ModelEntry>()
+// 失敗したロードはキャッシュから外し、エラーだけ残す（useModel はエラーを投げ、loadModel は再試行する）
+const failures = new Map<string, unknown>()
+const listeners = new Set<() => void>()
+
+function notify() {
+  listeners.forEach((fn) => fn())
+}
+
+async function fetchWithProgress(url: string, entry: ModelEntry): Promise<ArrayBuffer> {
+  const res = await fetch(url)
+  if (!res.ok) throw new Error(`Failed to load ${url}: ${res.status}`)
+  entry.total = Number(res.headers.get('content-length')) || entry.total
+  if (!res.body) {
+    const buffer = await res.arrayBuffer()
+    entry.loaded = buffer.byteLength
+    return buffer
+  }
+
+  const reader = res.body.getReader()
+  const chunks: Uint8Array[] = []
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    chunks.push(value)
+    entry.loaded += value.byteLength
+    notify()
+  }
+  const buffer = new Uint8Array(entry.loaded)
+  let offset = 0
+  for (const chunk of chunks) {
+    buffer.set(chunk, offset)
+    offset += chunk.byteLength
+  }
+  return buffer.buffer
+}
+
+// drei の useGLTF と同じく、名前付きの nodes / materials を引けるようにする
+function buildGraph(gltf: GLTF): ModelAsset {
+  const nodes: ModelAsset['nodes'] = {}
+  const materials: ModelAsset['materials'] = {}
+  gltf.scene.traverse((obj) => {
+    if (obj.name) nodes[obj.name] = obj
+    const material = (obj as THREE.Mesh).material
+    if (!material) return
+    for (const m of Array.isArray(material) ? material : [material]) {
+      if (m.name && !materials[m.name]) materials[m.name] = m
+    }
+  })
+  return Object.assign(gltf, { nodes, materials })
+}
+
+function loadEntry(url: string, src: string): ModelEntry {
+  const cached = entries.get(url)
+  if (cached) return cached
+
+  const current = { loaded: 0, total: manifest.models[src]?.bytes ?? 0 } as ModelEntry
+  current.promise = fetchWithProgress(url, current)
+    .then(async (buffer) => {
+      await rendererReady
+      const gltf = await gltfLoader.parseAsync(buffer, url.slice(0, url.lastIndexOf('/') + 1))
+      current.asset = buildGraph(gltf)
+      current.total = Math.max(current.loaded, current.total, 1)
+      notify()
+      return current.asset
+    })
+    .catch((error) => {
+      if (entries.get(url) === current) entries.delete(url)
+      failures.set(url, error)
+      notify()
+      throw error
+    })
+  entries.set(url, current)
+  return current
+}
+
+/** ロード開始（Suspense 外から。完了で resolve） */
+export function loadModel(src: string, lod = 0): Promise<ModelAsset> {
+  const url = modelUrl(src, lod)
+  failures.delete(url)
+  return loadEntry(url, src).promise
+}
+
+/** Suspense 対応のモデル取得（useGLTF 相当） */
+export function useModel(src: string, lod = 0): ModelAsset {
+  const gl = useThree((s) => s.gl)
+  registerRenderer(gl)
+  const url = modelUrl(src, lod)
+  // 失敗済みなら再取得せずエラー境界へ（Suspense の再レンダーで取得を繰り返さない）
+  if (failures.has(url)) throw failures.get(url)
+  const entry = loadEntry(url, src)
+  if (!entry.asset) throw entry.promise
+  return entry.asset
+}
+
+/**
+ * LOD を切り替えられる useModel。初回は段階ロードで先読み済みの LOD0 を使い、
+ * 指定 LOD はバックグラウンドで読み込んでから差し替える（Suspense に落とすとティア変更のたびに消えるため）
+ */
+export function useModelAtLod(src: string, lod: number): ModelAsset {
+  const [shownLod, setShownLod] = useState(0)
+  useEffect(() => {
+    if (lod === shownLod) return
+    let cancelled = false
+    loadModel(src, lod).then(() => { if (!cancelled) setShownLod(lod) }, () => {})
+    return () => { cancelled = true }
+  }, [src, lod, shownLod])
+  return useModel(src, shownLod)
+}
+
+// --- Progress ---
+
+/**
+ * 指定モデル群の進捗（0〜1、パース完了で 1）
+ * 全モデルのサイズが分かればバイト比、不明なものがあればモデル単位の平均
+ */
+export function getModelProgress(srcs: string[], lod = 0): number {
+  if (srcs.length === 0) return 1
+  let loaded = 0
+  let total = 0
+  let fractionSum = 0
+  let sized = true
+  let done = true
+  for (const src of srcs) {
+    const entry = entries.get(modelUrl(src, lod))
+    const size = entry?.total ?? manifest.models[src]?.bytes ?? 0
+    if (entry?.asset) {
+      loaded += size
+      total += size
+      fractionSum += 1
+      continue
+    }
+    done = false
+    if (size <= 0) sized = false
+    const bytes = Math.min(entry?.loaded ?? 0, size)
+    loaded += bytes
+    total += size
+    fractionSum += size > 0 ? bytes / size : 0
+  }
+  if (done) return 1
+  const progress = sized && total > 0 ? loaded / total : fractionSum / srcs.length
+  // ダウンロード完了〜パース中は 100% にしない
+  return Math.min(progress, 0.99)
+}
+
+/** 進捗・完了の通知を購読する（解除関数を返す） */
+export function subscribeModelProgress(listener: () => void): () => void {
+  listeners.add(listener)
+  return () => { listeners.delete(listener) }
+}
@@ -0,0 +1,102 @@
+// --- フレームプロファイルの集計ストア ---
+// dev または ?profile 付き URL のときだけ、FrameProfiler.tsx（Canvas 内）が書き込む。
+// three.js に依存しないため、Canvas 外の ProfilerHud からも読める。
+// 集計値は ProfilerHud（画面オーバーレイ）と scripts/bench-scene.mjs（window.__sceneProfile）が読む。
+// ※ 計測できるのは CPU 側の時間のみ。GPU の実行時間は含まれない。
+
+export const PROFILING = typeof window !== 'undefined'
+  && (import.meta.env.DEV || new URLSearchParams(window.location.search).has('profile'))
+
+export interface TimingStat {
+  /** 累計（ms） */
+  total: number
+  max: number
+  calls: number
+}
+
+export interface RendererSnapshot {
+  calls: number
+  triangles: number
+  points: number
+  lines: number
+  programs: number
+  geometries: number
+  textures: number
+  /** テクスチャの推定 GPU メモリ（bytes、ミップマップ込み） */
+  textureBytes: number
+}
+
+export interface ProfileData {
+  frames: number
+  timings: Record<string, TimingStat>
+  /** rAF 間隔（ms） */
+  frameIntervals: number[]
+  /** 1 フレームの CPU 時間（全 useFrame + 描画、ms） */
+  frameCpu: number[]
+  renderer: RendererSnapshot
+  /** 計測期間中の renderer 値の最大 */
+  rendererPeak: RendererSnapshot
+}
+
+const MAX_SAMPLES = 20_000
+
+const emptyRenderer = (): RendererSnapshot => ({
+  calls: 0, triangles: 0, points: 0, lines: 0, programs: 0, geometries: 0, textures: 0, textureBytes: 0,
+})
+
+const profile: ProfileData = {
+  frames: 0,
+  timings: {},
+  frameIntervals: [],
+  frameCpu: [],
+  renderer: emptyRenderer(),
+  rendererPeak: emptyRenderer(),
+}
+
+export function recordTiming(name: string, ms: number) {
+  const stat = profile.timings[name] ?? (profile.timings[name] = { total: 0, max: 0, calls: 0 })
+  stat.total += ms
+  stat.calls++
+  if (ms > stat.max) stat.max = ms
+}
+
+export function recordFrame(interval: number, cpu: number) {
+  profile.frames++
+  if (profile.frameIntervals.length < MAX_SAMPLES) {
+    profile.frameIntervals.push(interval)
+    profile.frameCpu.push(cpu)
+  }
+}
+
+/** 1 フレーム分の renderer.info（RendererStats が毎フレーム書き込む） */
+export const rendererStats = profile.renderer
+
+export function recordRendererPeak() {
+  const peak = profile.rendererPeak
+  for (const key of Object.keys(peak) as (keyof RendererSnapshot)[]) {
+    if (rendererStats[key] > peak[key]) peak[key] = rendererStats[key]
+  }
+}
+
+export function resetProfile() {
+  profile.frames = 0
+  profile.timings = {}
+  profile.frameIntervals = []
+  profile.frameCpu = []
+  profile.rendererPeak = emptyRenderer()
+}
+
+export function readProfile(): ProfileData {
+  return {
+    frames: profile.frames,
+    timings: Object.fromEntries(Object.entries(profile.timings).map(([k, v]) => [k, { ...v }])),
+    frameIntervals: profile.frameIntervals.slice(),
+    frameCpu: profile.frameCpu.slice(),
+    renderer: { ...profile.renderer },
+    rendererPeak: { ...profile.rendererPeak },
+  }
+}
+
+if (PROFILING) {
+  (window as any).__sceneProfile = { read: readProfile, reset: resetProfile }
+}
@@ -0,0 +1,108 @@
+// Adaptive quality - Tier ladder & budgets
+
+export type QualityTierName = 'low' | 'medium' | 'high' | 'ultra'
+
+export interface QualityBudget {
+  name: QualityTierName
+  /** devicePixelRatio の上限 */
+  dpr: number
+  bloom: boolean
+  /** Bloom の内部解像度（1.0 = フル） */
+  bloomResolutionScale: number
+  /** Cloud segments の倍率 */
+  cloudDetail: number
+  /** 曇天・雨天時の3層目の雲 */
+  extraCloud: boolean
+  sparkles: number
+  rainParticles: number
+  circuitParticles: number
+  stars: number
+  birds: number
+  /** 鳥・結晶の GLB の LOD（0 = フル。LOD を持たないモデルは最も近いレベルになる） */
+  modelLod: number
+  /** OrbitalRing 等の遠景装飾をマウントするか */
+  optionalAssets: boolean
+}
+
+// index 0 が最軽量。ultra = 従来のデスクトップ設定、high ≒ 従来のモバイル設定
+// 粒子は GPU シミュレーション（GpuParticles）のため、雨は CPU 時代より多めに割り当てる
+export const QUALITY_TIERS: QualityBudget[] = [
+  {
+    name: 'low',
+    dpr: 1,
+    bloom: false,
+    bloomResolutionScale: 0.5,
+    cloudDetail: 0.4,
+    extraCloud: false,
+    sparkles: 80,
+    rainParticles: 300,
+    circuitParticles: 150,
+    stars: 800,
+    birds: 2,
+    modelLod: 2,
+    optionalAssets: false,
+  },
+  {
+    name: 'medium',
+    dpr: 1.25,
+    bloom: true,
+    bloomResolutionScale: 0.5,
+    cloudDetail: 0.6,
+    extraCloud: false,
+    sparkles: 150,
+    rainParticles: 600,
+    circuitParticles: 300,
+    stars: 1500,
+    birds: 3,
+    modelLod: 1,
+    optionalAssets: false,
+  },
+  {
+    name: 'high',
+    dpr: 1.5,
+    bloom: true,
+    bloomResolutionScale: 0.75,
+    cloudDetail: 1,
+    extraCloud: true,
+    sparkles: 300,
+    rainParticles: 1000,
+    circuitParticles: 550,
+    stars: 3000,
+    birds: 3,
+    modelLod: 0,
+    optionalAssets: false,
+  },
+  {
+    name: 'ultra',
+    dpr: 2,
+    bloom: true,
+    bloomResolutionScale: 1,
+    cloudDetail: 1,
+    extraCloud: true,
+    sparkles: 300,
+    rainParticles: 1600,
+    circuitParticles: 550,
+    stars: 3000,
+    birds: 5,
+    modelLod: 0,
+    optionalAssets: true,
+  },
+]
+
+export const MAX_TIER = QUALITY_TIERS.length - 1
+
+/** ?quality=<name> で固定されたティア（ベンチマーク・見た目確認用）。未指定なら null */
+export function getPinnedTier(): number | null {
+  if (typeof window === 'undefined') return null
+  const name = new URLSearchParams(window.location.search).get('quality')
+  const index = QUALITY_TIERS.findIndex((t) => t.name === name)
+  return index >= 0 ? index : null
+}
+
+/** 計測前の初期ティア（狭い画面は high から開始し、実測で上下させる） */
+export function getInitialTier(breakpoint = 768): number {
+  if (typeof window === 'undefined') return MAX_TIER
+  const pinned = getPinnedTier()
+  if (pinned !== null) return pinned
+  return window.innerWidth < breakpoint ? 2 : MAX_TIER
+}
@@ -0,0 +1,85 @@
+import * as THREE from 'three'
+
+// --- シーンリソースレジストリ ---
+// GLB シーンをメッシュ単位のパーツ（geometry + material + ルート相対行列）に展開し、
+// 同じソース・同じ variant なら何度呼んでも同一のパーツ配列を返す。
+// マテリアルはソースごとに 1 回だけ複製し、インスタンス単位のパラメータ
+// （instanceParams: x = emissiveIntensity, y = opacity 乗数）を読むようにパッチする。
+// program cache key はマテリアルの種類 + variant ごと（同じ種類・variant のパッチ済みマテリアルだけが program を共有する）。
+// マルチマテリアルのメッシュは geometry.groups のまま、マテリアル配列として 1 パーツにする。
+
+export interface ActorPart {
+  geometry: THREE.BufferGeometry
+  /** 配列の場合は geometry.groups の materialIndex で参照される */
+  material: THREE.Material | THREE.Material[]
+  /** GLB ルートの親から見たローカル行列（ルート自身の変換を含む） */
+  matrix: THREE.Matrix4
+}
+
+/** variant ごとのマテリアル補正（複製後に 1 回だけ適用される） */
+export type MaterialPrepare = (material: THREE.MeshStandardMaterial) => void
+
+const partsCache = new WeakMap<THREE.Object3D, Map<string, ActorPart[]>>()
+
+export function getActorParts(
+  scene: THREE.Object3D,
+  variant = 'default',
+  prepare?: MaterialPrepare,
+): ActorPart[] {
+  let byVariant = partsCache.get(scene)
+  if (!byVariant) {
+    byVariant = new Map()
+    partsCache.set(scene, byVariant)
+  }
+  const cached = byVariant.get(variant)
+  if (cached) return cached
+
+  const materials = new Map<string, THREE.Material>()
+  const parts: ActorPart[] = []
+
+  const visit = (object: THREE.Object3D, parentMatrix: THREE.Matrix4) => {
+    object.updateMatrix()
+    const matrix = new THREE.Matrix4().multiplyMatrices(parentMatrix, object.matrix)
+    const mesh = object as THREE.Mesh
+    if (mesh.isMesh) {
+      const instanced = (source: THREE.Material) => {
+        let material = materials.get(source.uuid)
+        if (!material) {
+          material = createInstancedMaterial(source, variant, prepare)
+          materials.set(source.uuid, material)
+        }
+        return material
+      }
+      const material = Array.isArray(mesh.material) ? mesh.material.map(instanced) : instanced(mesh.material)
+      if (Array.isArray(material) && mesh.geometry.groups.length === 0) {
+        console.warn(`[sceneRegistry] ${mesh.name || mesh.uuid}: material array without geometry groups is not drawn`)
+      }
+      parts.push({ geometry: mesh.geometry, material, matrix })
+    }
+    object.children.forEach((child) => visit(child, matrix))
+  }
+  visit(scene, new THREE.Matrix4())
+
+  byVariant.set(variant, parts)
+  return parts
+}
+
+function createInstancedMaterial(source: THREE.Material, variant: string, prepare?: MaterialPrepare): THREE.Material {
+  const material = source.clone()
+  const std = material as THREE.MeshStandardMaterial
+  // 発光強度はインスタンス属性で与える
+  if (std.emissive) std.emissiveIntensity = 1
+  if (prepare) prepare(std)
+  material.onBeforeCompile = (shader) => {
+    shader.vertexShader = shader.vertexShader
+      .replace('#include <common>', '#include <common>\nattribute vec2 instanceParams;\nvarying vec2 vInstanceParams;')
+      .replace('#include <begin_vertex>', '#include <begin_vertex>\nvInstanceParams = instanceParams;')
+    shader.fragmentShader = shader.fragmentShader
+      .replace('#include <common>', '#include <common>\nvarying vec2 vInstanceParams;')
+      .replace('#include <alphamap_fragment>', '#include <alphamap_fragment>\ndiffuseColor.a *= vInstanceParams.y;')
+      .replace('#include <emissivemap_fragment>', '#include <emissivemap_fragment>\ntotalEmissiveRadiance *= vInstanceParams.x;')
+  }
+  const cacheKey = `actor-instance:${material.type}:${variant}`
+  material.customProgramCacheKey = () => cacheKey
+  return material
+}
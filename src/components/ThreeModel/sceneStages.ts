@@ -0,0 +1,78 @@
+import { useEffect, useState } from 'react'
+import { getModelProgress, loadModel, subscribeModelProgress } from './modelAssets'
+
+// --- 段階ロード ---
+// ステージを順番に読み込み、完了したステージ数と各ステージの進捗を返す。
+// 前のステージが終わるまで次のダウンロードは始めない（帯域を表示中のアセットに集中させる）。
+// idle: true のステージはブラウザのアイドル時間まで開始を遅らせる。
+
+export interface LoadStage {
+  id: string
+  /** ローディング表示用のラベル */
+  label: string
+  models: string[]
+  idle?: boolean
+}
+
+export interface StageProgress {
+  id: string
+  label: string
+  /** 0〜1 */
+  progress: number
+}
+
+const IDLE_TIMEOUT = 3000 // requestIdleCallback が来ない場合でもこの時間で開始
+
+function waitForIdle(): Promise<void> {
+  return new Promise((resolve) => {
+    if ('requestIdleCallback' in window) {
+      window.requestIdleCallback(() => resolve(), { timeout: IDLE_TIMEOUT })
+    } else {
+      setTimeout(resolve, 200)
+    }
+  })
+}
+
+function snapshot(stages: LoadStage[]): StageProgress[] {
+  return stages.map(({ id, label, models }) => ({ id, label, progress: getModelProgress(models) }))
+}
+
+export function useStagedLoading(stages: LoadStage[]): { ready: number; progress: StageProgress[] } {
+  const [ready, setReady] = useState(0)
+  const [progress, setProgress] = useState(() => snapshot(stages))
+
+  // ステージを順に実行（失敗したモデルは各コンポーネントの Suspense 側で扱い、後続は止めない）
+  useEffect(() => {
+    let cancelled = false
+    const run = async () => {
+      for (let i = 0; i < stages.length; i++) {
+        if (stages[i].idle) await waitForIdle()
+        if (cancelled) return
+        await Promise.all(stages[i].models.map((src) => loadModel(src).catch(() => {})))
+        if (cancelled) return
+        setReady(i + 1)
+      }
+    }
+    run()
+    return () => { cancelled = true }
+  }, [stages])
+
+  // 進捗はチャンク受信ごとに通知されるため、1 フレームに 1 回へまとめる
+  useEffect(() => {
+    let raf = 0
+    const update = () => {
+      raf = 0
+      setProgress(snapshot(stages))
+    }
+    const unsubscribe = subscribeModelProgress(() => {
+      if (!raf) raf = requestAnimationFrame(update)
+    })
+    update()
+    return () => {
+      unsubscribe()
+      cancelAnimationFrame(raf)
+    }
+  }, [stages])
+
+  return { ready, progress }
+}
@@ -0,0 +1,213 @@
+import type { WeatherMultipliers } from './weatherTypes'
+
+// --- シーン状態ストア ---
+// スクロール・Story・時間帯・天気の状態を 1 か所に集約する。three.js に依存しないため、
+// Story.astro（<script>）・ThreeModel アイランド・Scene.tsx（Canvas 内）から同じインスタンスを参照できる。
+//
+// - スクロール: scroll イベントを rAF で 1 回にまとめ、window.scrollY とキャッシュ済みのレイアウト
+//   （resize / load / ResizeObserver 時のみ計測）から算出する。スクロール中はレイアウトを読まない
+// - 速度・天気乗数の平滑化: Canvas の描画フレームごとに advanceSceneState() で 1 回だけ
+// - 読む側は sceneState のフィールドを直接参照する（MotionValue の購読・CustomEvent・React state を経由しない）
+// - 毎フレームの経路ではオブジェクトを生成しない（数値フィールド + Float32Array）
+
+export type TimePeriod = 'dawn' | 'morning' | 'afternoon' | 'evening' | 'night'
+
+export interface SceneState {
+  /** ページ全体のスクロール進捗（0〜1） */
+  pageScroll: number
+  /** Story 区間を除外したスクロール進捗（0〜1 / ライティング・城の回転・発光用） */
+  scroll: number
+  /** scroll の変化速度（|Δscroll| × 100 / フレーム、平滑化済み） */
+  scrollVelocity: number
+  /** Story セクション内の進捗（0〜1） */
+  storyProgress: number
+  /** 表示中の Story ブロック（なければ -1 / Story.astro が書き込む） */
+  storyBlock: number
+  inStory: boolean
+  /** リアルタイム時間帯 */
+  period: TimePeriod
+  timeAmbient: number
+  timeCyanBoost: number
+  /** 天気乗数の目標値 [ambient, dir, cyan]（天気 OFF / 未取得は 1.0） */
+  weatherTarget: Float32Array
+  /** 天気乗数（目標値へ ~2s で追従） */
+  weather: Float32Array
+}
+
+export const WEATHER_AMBIENT = 0
+export const WEATHER_DIR = 1
+export const WEATHER_CYAN = 2
+
+export const sceneState: SceneState = {
+  pageScroll: 0,
+  scroll: 0,
+  scrollVelocity: 0,
+  storyProgress: 0,
+  storyBlock: -1,
+  inStory: false,
+  period: 'afternoon',
+  timeAmbient: 0.9,
+  timeCyanBoost: 0.3,
+  weatherTarget: new Float32Array([1, 1, 1]),
+  weather: new Float32Array([1, 1, 1]),
+}
+
+// --- リアルタイム連動 レイヤー1: 時間帯 ---
+
+const TIME_OF_DAY_INTERVAL = 30 * 60 * 1000 // 30分ごと
+
+const TIME_PERIODS: Record<TimePeriod, { ambient: number; cyanBoost: number }> = {
+  dawn: { ambient: 0.75, cyanBoost: 0.4 },
+  morning: { ambient: 1.0, cyanBoost: 0.2 },
+  afternoon: { ambient: 0.9, cyanBoost: 0.3 },
+  evening: { ambient: 0.6, cyanBoost: 0.7 },
+  night: { ambient: 0.3, cyanBoost: 1.0 },
+}
+
+function periodForHour(hour: number): TimePeriod {
+  if (hour >= 5 && hour < 8) return 'dawn'
+  if (hour >= 8 && hour < 12) return 'morning'
+  if (hour >= 12 && hour < 17) return 'afternoon'
+  if (hour >= 17 && hour < 20) return 'evening'
+  return 'night'
+}
+
+/** `?period=dawn|morning|afternoon|evening|night` で時間帯を固定する（ベンチマーク / デバッグ用） */
+function pinnedPeriod(): TimePeriod | null {
+  const value = new URLSearchParams(window.location.search).get('period')
+  return value && value in TIME_PERIODS ? (value as TimePeriod) : null
+}
+
+function refreshTimeOfDay(pinned: TimePeriod | null) {
+  const period = pinned ?? periodForHour(new Date().getHours())
+  sceneState.period = period
+  sceneState.timeAmbient = TIME_PERIODS[period].ambient
+  sceneState.timeCyanBoost = TIME_PERIODS[period].cyanBoost
+}
+
+// --- スクロール ---
+
+// レイアウトのキャッシュ（px）
+const layout = {
+  scrollable: 0,
+  storyTop: 0,
+  storyRange: 0,
+  /** main-content 先頭（= Story 終了位置）。未計測なら -1 */
+  mainTop: -1,
+}
+
+// main-content が見つからないときの Story 終了位置（pageScroll 換算）
+const FALLBACK_STORY_END = 0.3
+
+function measureLayout() {
+  const scrollY = window.scrollY
+  layout.scrollable = document.documentElement.scrollHeight - window.innerHeight
+  const story = document.getElementById('story')
+  if (story) {
+    layout.storyTop = story.getBoundingClientRect().top + scrollY
+    layout.storyRange = story.offsetHeight - window.innerHeight
+  }
+  const main = document.querySelector<HTMLElement>('.main-content')
+  layout.mainTop = main ? main.offsetTop : -1
+}
+
+const clamp01 = (v: number) => (v < 0 ? 0 : v > 1 ? 1 : v)
+
+export type ScrollListener = (state: SceneState) => void
+const scrollListeners = new Set<ScrollListener>()
+
+function sampleScroll() {
+  const y = window.scrollY
+  const { scrollable, storyTop, storyRange, mainTop } = layout
+
+  const page = scrollable > 0 ? clamp01(y / scrollable) : 0
+  sceneState.pageScroll = page
+
+  // Story 区間を除外した進捗（Story 終了位置 = 0）
+  const storyEnd = mainTop >= 0 && scrollable > 0 ? mainTop / scrollable : FALLBACK_STORY_END
+  sceneState.scroll = storyEnd <= 0 || storyEnd >= 1 ? page
+    : page <= storyEnd ? 0
+    : (page - storyEnd) / (1 - storyEnd)
+
+  const storyProgress = storyRange > 0 ? clamp01((y - storyTop) / storyRange) : 0
+  sceneState.storyProgress = storyProgress
+  sceneState.inStory = storyProgress > 0 && storyProgress < 1
+
+  scrollListeners.forEach(notify)
+}
+
+const notify = (listener: ScrollListener) => listener(sceneState)
+
+let scrollScheduled = false
+
+function flushScroll() {
+  scrollScheduled = false
+  sampleScroll()
+}
+
+function onScroll() {
+  if (scrollScheduled) return
+  scrollScheduled = true
+  requestAnimationFrame(flushScroll)
+}
+
+function onLayoutChange() {
+  measureLayout()
+  onScroll()
+}
+
+let started = false
+
+/** スクロール監視・時間帯の更新を開始する（複数回呼んでも 1 回だけ） */
+export function startSceneState() {
+  if (started || typeof window === 'undefined') return
+  started = true
+
+  const pinned = pinnedPeriod()
+  refreshTimeOfDay(pinned)
+  if (!pinned) setInterval(() => refreshTimeOfDay(null), TIME_OF_DAY_INTERVAL)
+
+  measureLayout()
+  sampleScroll()
+  window.addEventListener('scroll', onScroll, { passive: true })
+  window.addEventListener('resize', onLayoutChange)
+  window.addEventListener('load', onLayoutChange)
+  // 画像の遅延読み込み等でページの高さが変わったら再計測
+  new ResizeObserver(onLayoutChange).observe(document.body)
+}
+
+/** スクロール状態が更新されるたび（rAF 内）に呼ばれる */
+export function subscribeScroll(listener: ScrollListener): () => void {
+  scrollListeners.add(listener)
+  return () => { scrollListeners.delete(listener) }
+}
+
+// --- 天気 ---
+
+/** 天気乗数の目標値を設定（null = ニュートラル） */
+export function setWeatherTarget(multipliers: WeatherMultipliers | null) {
+  const target = sceneState.weatherTarget
+  target[WEATHER_AMBIENT] = multipliers?.ambientIntensity ?? 1.0
+  target[WEATHER_DIR] = multipliers?.dirIntensity ?? 1.0
+  target[WEATHER_CYAN] = multipliers?.cyanBoost ?? 1.0
+}
+
+// --- フレームごとの平滑化（Scene.tsx の SceneStateDriver が 1 フレーム 1 回呼ぶ） ---
+
+const VELOCITY_SMOOTHING = 0.1
+const WEATHER_LERP = 0.02
+
+let prevScroll = 0
+
+export function advanceSceneState() {
+  const scroll = sceneState.scroll
+  const rawVelocity = Math.abs(scroll - prevScroll) * 100
+  prevScroll = scroll
+  // なめらかに追従（急に消えない）
+  sceneState.scrollVelocity += (rawVelocity - sceneState.scrollVelocity) * VELOCITY_SMOOTHING
+
+  const { weather, weatherTarget } = sceneState
+  for (let i = 0; i < weather.length; i++) {
+    weather[i] += (weatherTarget[i] - weather[i]) * WEATHER_LERP
+  }
+}
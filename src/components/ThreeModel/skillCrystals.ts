@@ -0,0 +1,27 @@
+import skillsData from '@/data/skills.json'
+import type { SkillEntry, OrbitParams } from '@/data/skillTypes'
+export type { OrbitParams }
+
+// --- スキルクリスタルのデータ ---
+// three.js に依存しないため、Canvas 外（詳細パネル・ロード段階の定義）からも参照できる
+
+// 全クリスタル共通の公転速度（等間隔を維持するため統一）
+export const SHARED_ORBIT_SPEED = 0.10 // rad/s
+
+export const SKILL_CRYSTALS = (skillsData as SkillEntry[])
+  .filter(s => s.crystal !== null)
+  .map(s => ({
+    id: s.id,
+    model: s.crystal!.model,
+    orbit: s.crystal!.orbit,
+    title: s.title,
+    description: s.description,
+    tags: s.skillTags,
+    emissiveBase: s.crystal!.emissiveBase,
+    lightColor: s.crystal!.lightColor,
+  }))
+
+export type SkillCrystalData = (typeof SKILL_CRYSTALS)[number]
+
+/** 結晶ステージで読み込むモデル（重複なし） */
+export const CRYSTAL_MODEL_URLS = [...new Set(SKILL_CRYSTALS.map((c) => c.model))]
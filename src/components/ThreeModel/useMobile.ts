@@ -0,0 +1,15 @@
+import { useState, useEffect } from 'react'
+
+/** Mobile detection hook */
+export function useMobile(breakpoint = 768): boolean {
+  const [isMobile, setIsMobile] = useState(false)
+
+  useEffect(() => {
+    const check = () => setIsMobile(window.innerWidth < breakpoint)
+    check()
+    window.addEventListener('resize', check)
+    return () => window.removeEventListener('resize', check)
+  }, [breakpoint])
+
+  return isMobile
+}
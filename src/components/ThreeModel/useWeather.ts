@@ -2,37 +2,14 @@ import { useState, useEffect, useCallback, useRef } from 'react'
 import {
   type WeatherCategory,
   type WeatherData,
-  mapWmoToCategory,
   getWeatherDisplay,
   WEATHER_MULTIPLIERS,
 } from './weatherTypes'
+import { fetchWeather, readCachedWeather, readCachedPlaceName, reverseGeocode } from './weatherClient'
+import { installWeatherStubFromUrl } from './weatherStub'
 
-// --- Module-level cache (TTL 30 min) ---
-interface CacheEntry {
-  data: WeatherData
-  timestamp: number
-  lat: number
-  lon: number
-}
-
-const CACHE_TTL = 30 * 60 * 1000 // 30 minutes
-let cachedEntry: CacheEntry | null = null
-
-function getCached(lat: number, lon: number): WeatherData | null {
-  if (
-    cachedEntry &&
-    cachedEntry.lat === lat &&
-    cachedEntry.lon === lon &&
-    Date.now() - cachedEntry.timestamp < CACHE_TTL
-  ) {
-    return cachedEntry.data
-  }
-  return null
-}
-
-function setCache(lat: number, lon: number, data: WeatherData) {
-  cachedEntry = { data, timestamp: Date.now(), lat, lon }
-}
+// `?weather-stub` 付き URL では通信をスタブに差し替える（オフライン検証・ベンチマーク用）
+installWeatherStubFromUrl()
 
 // Default location: Tokyo
 const TOKYO = { lat: 35.6762, lon: 139.6503, name: 'Tokyo' }
@@ -89,48 +66,6 @@ export interface UseWeatherReturn {
   refetch: () => void
 }
 
-// Reverse geocoding: coordinates → city name (with 1 retry)
-async function reverseGeocode(lat: number, lon: number, retries = 1): Promise<string> {
-  try {
-    const url = `https://nominatim.openstreetmap.org/reverse?lat=${lat}&lon=${lon}&format=json&accept-language=ja&zoom=10`
-    const res = await fetch(url, {
-      headers: { 'User-Agent': 'sp-webcreat-portfolio/1.0' },
-    })
-    if (!res.ok) throw new Error('Geocoding failed')
-    const json = await res.json()
-    const addr = json.address
-    // Prefer city → city_district(区) → municipality → town → village → county → state
-    const name = addr?.city || addr?.city_district || addr?.municipality
-      || addr?.town || addr?.village || addr?.county || addr?.state
-    if (name) return name
-    throw new Error('No address fields found')
-  } catch (e) {
-    if (retries > 0) {
-      await new Promise(r => setTimeout(r, 1000))
-      return reverseGeocode(lat, lon, retries - 1)
-    }
-    throw e
-  }
-}
-
-async function fetchWeather(lat: number, lon: number): Promise<WeatherData> {
-  const url = `https://api.open-meteo.com/v1/forecast?latitude=${lat}&longitude=${lon}&current_weather=true`
-  const res = await fetch(url)
-  if (!res.ok) throw new Error(`Weather API error: ${res.status}`)
-  const json = await res.json()
-  const cw = json.current_weather
-  const wmoCode: number = cw.weathercode
-  const category = mapWmoToCategory(wmoCode)
-  return {
-    category,
-    multipliers: WEATHER_MULTIPLIERS[category],
-    display: getWeatherDisplay(wmoCode),
-    temperature: cw.temperature,
-    windSpeed: cw.windspeed,
-    wmoCode,
-  }
-}
-
 export function useWeather({ enabled, manualOverride }: UseWeatherOptions): UseWeatherReturn {
   const [location, setLocationState] = useState<LocationState>(() => loadStoredLocation() ?? TOKYO)
   const [apiWeather, setApiWeather] = useState<WeatherData | null>(null)
@@ -140,26 +75,28 @@ export function useWeather({ enabled, manualOverride }: UseWeatherOptions): UseW
   const [error, setError] = useState<string | null>(null)
   const fetchIdRef = useRef(0)
 
-  const doFetch = useCallback(async (loc: LocationState) => {
-    const cached = getCached(loc.lat, loc.lon)
+  // Stale-while-revalidate: 永続キャッシュを即反映し、期限切れなら裏で再取得
+  const doFetch = useCallback(async (loc: LocationState, force = false) => {
+    const cached = readCachedWeather(loc.lat, loc.lon)
     if (cached) {
-      setApiWeather(cached)
+      setApiWeather(cached.data)
       setError(null)
-      return
+      if (cached.fresh && !force) return
     }
 
     const id = ++fetchIdRef.current
-    setIsLoading(true)
+    // 表示中のデータがあれば再検証中もローディング表示にしない
+    setIsLoading(!cached)
     setError(null)
     try {
       const data = await fetchWeather(loc.lat, loc.lon)
       if (id !== fetchIdRef.current) return // stale
-      setCache(loc.lat, loc.lon, data)
       setApiWeather(data)
     } catch (e) {
       if (id !== fetchIdRef.current) return
       setError(e instanceof Error ? e.message : 'Unknown error')
-      setApiWeather(null)
+      // 再検証の失敗ではキャッシュの天気を維持
+      if (!cached) setApiWeather(null)
     } finally {
       if (id === fetchIdRef.current) setIsLoading(false)
     }
@@ -193,8 +130,8 @@ export function useWeather({ enabled, manualOverride }: UseWeatherOptions): UseW
       async (pos) => {
         const lat = Math.round(pos.coords.latitude * 10000) / 10000
         const lon = Math.round(pos.coords.longitude * 10000) / 10000
-        // Set immediately with temporary name, then resolve city name
-        setLocationState({ lat, lon, name: '...' })
+        // Set immediately with cached or temporary name, then resolve city name
+        setLocationState({ lat, lon, name: readCachedPlaceName(lat, lon) ?? '...' })
         try {
           const name = await reverseGeocode(lat, lon)
           const resolved = { lat, lon, name }
@@ -224,9 +161,8 @@ export function useWeather({ enabled, manualOverride }: UseWeatherOptions): UseW
   }, [])
 
   const refetch = useCallback(() => {
-    // Clear cache and re-fetch
-    cachedEntry = null
-    doFetch(location)
+    // Bypass freshness and re-fetch (stale data stays visible meanwhile)
+    doFetch(location, true)
   }, [location, doFetch])
 
   // Manual override: synthesize WeatherData from the category
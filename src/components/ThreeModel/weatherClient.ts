@@ -0,0 +1,238 @@
+import {
+  type WeatherData,
+  mapWmoToCategory,
+  getWeatherDisplay,
+  WEATHER_MULTIPLIERS,
+} from './weatherTypes'
+
+// Weather data layer - open-meteo / Nominatim client
+//
+// - localStorage の永続キャッシュ（丸めた座標をキーに LRU で最大件数を保持）
+//   読み出し時の最終利用時刻の更新はメモリのみ。書き込みはネットワーク取得後だけ（次の保存時にまとめて反映）
+// - stale-while-revalidate: 期限切れでも STALE_TTL 内ならそのまま返し、裏で再取得
+// - 同じキーへの同時リクエストは 1 本にまとめる（in-flight dedupe）
+// - リクエストごとのタイムアウト（AbortController）
+// - 通信は差し替え可能な transport 経由（ローカルのスタブサーバーでのオフライン検証用）
+
+// --- Transport ---
+
+export type WeatherTransport = (url: string, init: RequestInit) => Promise<Response>
+
+const defaultTransport: WeatherTransport = (url, init) => fetch(url, init)
+let transport = defaultTransport
+
+/** 通信関数を差し替える（null で既定の fetch に戻す） */
+export function setWeatherTransport(next: WeatherTransport | null) {
+  transport = next ?? defaultTransport
+}
+
+const WEATHER_TIMEOUT = 8000
+const GEOCODE_TIMEOUT = 8000
+
+async function requestJson(url: string, timeout: number, init: RequestInit = {}): Promise<any> {
+  const controller = new AbortController()
+  const timer = setTimeout(() => controller.abort(), timeout)
+  try {
+    const res = await transport(url, { ...init, signal: controller.signal })
+    if (!res.ok) throw new Error(`HTTP ${res.status}`)
+    return await res.json()
+  } catch (e) {
+    if (controller.signal.aborted) throw new Error(`Request timed out after ${timeout}ms`)
+    throw e
+  } finally {
+    clearTimeout(timer)
+  }
+}
+
+// --- Persistent LRU cache ---
+
+const STORAGE_KEY = 'sp-weather-cache-v1'
+
+const WEATHER_FRESH_TTL = 30 * 60 * 1000        // 30 minutes: no revalidation
+const WEATHER_STALE_TTL = 24 * 60 * 60 * 1000   // 24 hours: served stale while revalidating
+const GEOCODE_TTL = 30 * 24 * 60 * 60 * 1000    // 30 days
+const MAX_WEATHER_ENTRIES = 8
+const MAX_GEOCODE_ENTRIES = 16
+
+// multipliers / display は weatherTypes から復元する（テーブル変更に追従 + 同一参照を保つ）
+interface StoredWeather {
+  wmoCode: number
+  temperature: number
+  windSpeed: number
+  fetchedAt: number
+  usedAt: number
+}
+
+interface StoredGeocode {
+  name: string
+  fetchedAt: number
+  usedAt: number
+}
+
+interface CacheStore {
+  weather: Record<string, StoredWeather>
+  geocode: Record<string, StoredGeocode>
+}
+
+let store: CacheStore | null = null
+
+function loadStore(): CacheStore {
+  if (store) return store
+  store = { weather: {}, geocode: {} }
+  try {
+    const parsed = JSON.parse(localStorage.getItem(STORAGE_KEY) ?? 'null')
+    if (parsed && typeof parsed.weather === 'object' && typeof parsed.geocode === 'object') {
+      store = parsed as CacheStore
+    }
+  } catch { /* ignore */ }
+  return store
+}
+
+function evict<T extends { usedAt: number }>(entries: Record<string, T>, max: number) {
+  const keys = Object.keys(entries)
+  if (keys.length <= max) return
+  keys
+    .sort((a, b) => entries[a].usedAt - entries[b].usedAt)
+    .slice(0, keys.length - max)
+    .forEach((key) => { delete entries[key] })
+}
+
+function saveStore() {
+  if (!store) return
+  evict(store.weather, MAX_WEATHER_ENTRIES)
+  evict(store.geocode, MAX_GEOCODE_ENTRIES)
+  try {
+    localStorage.setItem(STORAGE_KEY, JSON.stringify(store))
+  } catch { /* ignore */ }
+}
+
+/** Cache key: coordinates rounded to 0.01° (~1 km) */
+export function coordKey(lat: number, lon: number): string {
+  return `${lat.toFixed(2)},${lon.toFixed(2)}`
+}
+
+export function clearWeatherCache() {
+  store = { weather: {}, geocode: {} }
+  try {
+    localStorage.removeItem(STORAGE_KEY)
+  } catch { /* ignore */ }
+}
+
+// --- Weather ---
+
+function toWeatherData({ wmoCode, temperature, windSpeed }: Pick<StoredWeather, 'wmoCode' | 'temperature' | 'windSpeed'>): WeatherData {
+  const category = mapWmoToCategory(wmoCode)
+  return {
+    category,
+    multipliers: WEATHER_MULTIPLIERS[category],
+    display: getWeatherDisplay(wmoCode),
+    temperature,
+    windSpeed,
+    wmoCode,
+  }
+}
+
+export interface CachedWeather {
+  data: WeatherData
+  /** false = 表示には使えるが再取得が必要 */
+  fresh: boolean
+}
+
+/** キャッシュを同期的に読む（STALE_TTL を過ぎたものは返さない） */
+export function readCachedWeather(lat: number, lon: number): CachedWeather | null {
+  const { weather } = loadStore()
+  const key = coordKey(lat, lon)
+  const entry = weather[key]
+  if (!entry) return null
+  const age = Date.now() - entry.fetchedAt
+  if (age > WEATHER_STALE_TTL) {
+    delete weather[key]
+    return null
+  }
+  entry.usedAt = Date.now()
+  return { data: toWeatherData(entry), fresh: age < WEATHER_FRESH_TTL }
+}
+
+const weatherRequests = new Map<string, Promise<WeatherData>>()
+
+/** ネットワークから取得してキャッシュを更新（同じキーの同時呼び出しは 1 本にまとめる） */
+export function fetchWeather(lat: number, lon: number): Promise<WeatherData> {
+  const key = coordKey(lat, lon)
+  const pending = weatherRequests.get(key)
+  if (pending) return pending
+
+  const request = (async () => {
+    const url = `https://api.open-meteo.com/v1/forecast?latitude=${lat}&longitude=${lon}&current_weather=true`
+    const json = await requestJson(url, WEATHER_TIMEOUT)
+    const cw = json.current_weather
+    const now = Date.now()
+    const entry: StoredWeather = {
+      wmoCode: cw.weathercode,
+      temperature: cw.temperature,
+      windSpeed: cw.windspeed,
+      fetchedAt: now,
+      usedAt: now,
+    }
+    loadStore().weather[key] = entry
+    saveStore()
+    return toWeatherData(entry)
+  })().finally(() => weatherRequests.delete(key))
+
+  weatherRequests.set(key, request)
+  return request
+}
+
+// --- Reverse geocoding ---
+
+export function readCachedPlaceName(lat: number, lon: number): string | null {
+  const { geocode } = loadStore()
+  const entry = geocode[coordKey(lat, lon)]
+  if (!entry || Date.now() - entry.fetchedAt > GEOCODE_TTL) return null
+  entry.usedAt = Date.now()
+  return entry.name
+}
+
+const geocodeRequests = new Map<string, Promise<string>>()
+
+async function requestPlaceName(lat: number, lon: number, retries: number): Promise<string> {
+  try {
+    const url = `https://nominatim.openstreetmap.org/reverse?lat=${lat}&lon=${lon}&format=json&accept-language=ja&zoom=10`
+    const json = await requestJson(url, GEOCODE_TIMEOUT, {
+      headers: { 'User-Agent': 'sp-webcreat-portfolio/1.0' },
+    })
+    const addr = json.address
+    // Prefer city → city_district(区) → municipality → town → village → county → state
+    const name = addr?.city || addr?.city_district || addr?.municipality
+      || addr?.town || addr?.village || addr?.county || addr?.state
+    if (name) return name
+    throw new Error('No address fields found')
+  } catch (e) {
+    if (retries > 0) {
+      await new Promise(r => setTimeout(r, 1000))
+      return requestPlaceName(lat, lon, retries - 1)
+    }
+    throw e
+  }
+}
+
+/** Reverse geocoding: coordinates → city name (cache → in-flight → network with 1 retry) */
+export function reverseGeocode(lat: number, lon: number): Promise<string> {
+  const cached = readCachedPlaceName(lat, lon)
+  if (cached) return Promise.resolve(cached)
+
+  const key = coordKey(lat, lon)
+  const pending = geocodeRequests.get(key)
+  if (pending) return pending
+
+  const request = requestPlaceName(lat, lon, 1)
+    .then((name) => {
+      const now = Date.now()
+      loadStore().geocode[key] = { name, fetchedAt: now, usedAt: now }
+      saveStore()
+      return name
+    })
+    .finally(() => geocodeRequests.delete(key))
+
+  geocodeRequests.set(key, request)
+  return request
+}
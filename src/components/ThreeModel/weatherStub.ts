@@ -0,0 +1,44 @@
+import { setWeatherTransport, type WeatherTransport } from './weatherClient'
+
+// --- 天気通信のスタブ（オフライン検証・ベンチマーク用） ---
+// `?weather-stub` 付き URL で open-meteo / Nominatim への通信を固定レスポンスに差し替える。
+// - `?weather-stub`: 晴れ・22℃・東京（150ms 遅延）
+// - `?weather-stub=offline`: すべて失敗（fetch のネットワークエラーと同じ TypeError）
+// - `?weather-stub=slow`: 応答しない（クライアント側のタイムアウトで失敗する）
+// localStorage のキャッシュはそのまま使うため、キャッシュあり / なしの両方を確認できる
+
+const STUB_WEATHER = { current_weather: { weathercode: 0, temperature: 22, windspeed: 3 } }
+const STUB_GEOCODE = { address: { city: '東京都' } }
+const STUB_DELAY = 150
+
+export type WeatherStubMode = 'ok' | 'offline' | 'slow'
+
+function abortable(signal: AbortSignal | null | undefined, run: (resolve: (res: Response) => void) => void) {
+  return new Promise<Response>((resolve, reject) => {
+    signal?.addEventListener('abort', () => reject(new DOMException('Aborted', 'AbortError')), { once: true })
+    run(resolve)
+  })
+}
+
+export function createStubTransport(mode: WeatherStubMode): WeatherTransport {
+  return (url, init) => {
+    if (mode === 'offline') return Promise.reject(new TypeError('Failed to fetch'))
+    return abortable(init.signal, (resolve) => {
+      if (mode === 'slow') return
+      const body = url.includes('nominatim') ? STUB_GEOCODE : STUB_WEATHER
+      setTimeout(() => resolve(new Response(JSON.stringify(body), {
+        headers: { 'Content-Type': 'application/json' },
+      })), STUB_DELAY)
+    })
+  }
+}
+
+/** URL に `?weather-stub` があればスタブ通信に差し替える（返り値は適用したモード） */
+export function installWeatherStubFromUrl(): WeatherStubMode | null {
+  if (typeof window === 'undefined') return null
+  const value = new URLSearchParams(window.location.search).get('weather-stub')
+  if (value === null) return null
+  const mode: WeatherStubMode = value === 'offline' || value === 'slow' ? value : 'ok'
+  setWeatherTransport(createStubTransport(mode))
+  return mode
+}
@@ -1,2 +1,11 @@
 /// <reference path="../.astro/types.d.ts" />
 /// <reference types="astro/client" />
+
+// integrations/optimize-models.mjs が生成するモデルマニフェスト
+declare module 'virtual:model-manifest' {
+  const manifest: {
+    models: Record<string, { url: string; lods: string[]; bytes: number; triangles: number }>
+    decoders: { draco: string; basis: string }
+  }
+  export default manifest
+}
@@ -1,5 +1,8 @@
 import { getCollection, type CollectionEntry } from 'astro:content';
 
+export type BlogPost = CollectionEntry<'blog'>;
+export type BlogCategory = BlogPost['data']['category'];
+
 export const categoryLabels: Record<string, string> = {
   tech: 'Tech',
   knowledge: 'Knowledge',
@@ -12,8 +15,10 @@ export const categoryColors: Record<string, string> = {
   diary: 'border-emerald-400 text-emerald-400',
 };
 
-/** Get all published (non-draft) blog posts, sorted by pubDate descending */
-export async function getPublishedPosts(): Promise<CollectionEntry<'blog'>[]> {
+/** Number of cards per listing page (/blog/, /blog/page/N/, category and tag pages) */
+export const POSTS_PER_PAGE = 10;
+
+async function loadPublishedPosts(): Promise<BlogPost[]> {
   const posts = await getCollection('blog', ({ data }) => {
     return import.meta.env.PROD ? data.draft !== true : true;
   });
@@ -23,12 +28,93 @@ export async function getPublishedPosts(): Promise<CollectionEntry<'blog'>[]> {
   );
 }
 
+// Sorted collection, loaded once per build (dev reloads every call so edits show up immediately)
+let publishedPosts: Promise<BlogPost[]> | null = null;
+
+/**
+ * Get all published (non-draft) blog posts, sorted by pubDate descending.
+ * The returned array is shared between callers — do not mutate it.
+ */
+export function getPublishedPosts(): Promise<BlogPost[]> {
+  if (import.meta.env.DEV) return loadPublishedPosts();
+  return (publishedPosts ??= loadPublishedPosts());
+}
+
 /** Get latest N published posts */
-export async function getLatestPosts(count: number): Promise<CollectionEntry<'blog'>[]> {
+export async function getLatestPosts(count: number): Promise<BlogPost[]> {
   const posts = await getPublishedPosts();
   return posts.slice(0, count);
 }
 
+export interface PostPage {
+  posts: BlogPost[];
+  /** 1-based */
+  currentPage: number;
+  lastPage: number;
+  total: number;
+  /** URL of page 1, e.g. `/blog/` or `/blog/tag/astro/` */
+  baseUrl: string;
+}
+
+/** `/blog/` → `/blog/` (page 1), `/blog/page/2/`, ... */
+export function pageUrl(baseUrl: string, page: number): string {
+  return page <= 1 ? baseUrl : `${baseUrl}page/${page}/`;
+}
+
+/** Rest parameter for `[...page].astro` routes (undefined = page 1) */
+export function pageParam(page: number): string | undefined {
+  return page <= 1 ? undefined : `page/${page}`;
+}
+
+/** Split posts into listing pages (always at least one page, possibly empty) */
+export function paginatePosts(posts: BlogPost[], baseUrl: string): PostPage[] {
+  const lastPage = Math.max(1, Math.ceil(posts.length / POSTS_PER_PAGE));
+  return Array.from({ length: lastPage }, (_, i) => ({
+    posts: posts.slice(i * POSTS_PER_PAGE, (i + 1) * POSTS_PER_PAGE),
+    currentPage: i + 1,
+    lastPage,
+    total: posts.length,
+    baseUrl,
+  }));
+}
+
+/** URL segment for a tag: `GitHub Actions` → `github-actions`, `CI/CD` → `ci-cd` */
+export function tagSlug(tag: string): string {
+  return tag
+    .normalize('NFKC')
+    .toLowerCase()
+    .replace(/[\s/\\?#%&+.:]+/g, '-')
+    .replace(/^-+|-+$/g, '');
+}
+
+export interface TagGroup {
+  slug: string;
+  /** Display label (first spelling found, posts are newest first) */
+  label: string;
+  posts: BlogPost[];
+}
+
+/** Published posts grouped by tag slug, sorted by label */
+export async function getTagGroups(): Promise<TagGroup[]> {
+  const groups = new Map<string, TagGroup>();
+  for (const post of await getPublishedPosts()) {
+    for (const tag of post.data.tags) {
+      const slug = tagSlug(tag);
+      if (!slug) continue;
+      const group = groups.get(slug) ?? { slug, label: tag, posts: [] };
+      if (group.posts.at(-1) !== post) group.posts.push(post);
+      groups.set(slug, group);
+    }
+  }
+  return [...groups.values()].sort((a, b) => a.label.localeCompare(b.label, 'ja'));
+}
+
+/** Published posts of one category (keeps the pubDate order) */
+export async function getPostsByCategory(category: string): Promise<BlogPost[]> {
+  const posts = await getPublishedPosts();
+  return posts.filter((post) => post.data.category === category);
+}
+
 /** Format a date as YYYY.MM.DD */
 export function formatDate(date: Date): string {
   const y = date.getFullYear();
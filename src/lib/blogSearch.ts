@@ -0,0 +1,199 @@
+// Blog search: tokenizer, build-time inverted index and client-side query.
+// This module is shared by the build (src/pages/blog/search-index.json.ts) and the
+// browser (BlogList search box), so it must not import astro:content or other server-only modules.
+//
+// Tokenization (same rules for documents and queries):
+// - NFKC + lowercase (full-width Latin → ASCII, half-width katakana → full-width)
+// - Latin / digits: whole words (`three.js` → `three`, `js`); a trailing `++` / `#` stays on the word
+//   (`c++`, `c#`, `f#`). Single letters are dropped from documents but kept in queries (prefix match)
+// - Kanji and katakana runs: character bigrams (`自動振` → `自動`, `動振`), single characters as-is
+//   (a single-character query matches every term containing it, so `雨` finds `雨天`)
+// - Hiragana runs: bigrams only in title / description / tags (mostly particles and okurigana in body text).
+//   A single hiragana character is kept in queries only and matches any term containing it
+
+export interface SearchDoc {
+  slug: string;
+  title: string;
+  description: string;
+  category: string;
+  /** Display date (YYYY.MM.DD) */
+  date: string;
+  /** ISO timestamp for <time datetime> */
+  datetime: string;
+  tags: string[];
+}
+
+export interface SearchSource extends SearchDoc {
+  /** Raw markdown body */
+  body: string;
+}
+
+export interface SearchIndex {
+  version: 1;
+  docs: SearchDoc[];
+  /** term → flat postings [docIndex, weight, docIndex, weight, ...] */
+  terms: Record<string, number[]>;
+}
+
+// Field weights: a term scores the sum of the fields it appears in
+const WEIGHT_TITLE = 8;
+const WEIGHT_TAG = 6;
+const WEIGHT_DESCRIPTION = 3;
+/** Body occurrences count once each, up to this cap */
+const MAX_BODY_WEIGHT = 5;
+
+const SEGMENT = /[a-z0-9]+(?:\+\+|#(?![a-z0-9]))?|[\p{Script=Han}々〆]+|[\p{Script=Katakana}ー]+|\p{Script=Hiragana}+/gu;
+const LATIN = /^[a-z0-9]/;
+const HIRAGANA = /^\p{Script=Hiragana}/u;
+
+function pushBigrams(run: string, out: string[]) {
+  const chars = [...run];
+  if (chars.length === 1) {
+    out.push(chars[0]);
+    return;
+  }
+  for (let i = 0; i < chars.length - 1; i++) out.push(chars[i] + chars[i + 1]);
+}
+
+interface TokenizeOptions {
+  /** Index hiragana runs (off for body text) */
+  kana?: boolean;
+  /** Query mode: keep single Latin letters and single hiragana characters */
+  query?: boolean;
+}
+
+/** Split text into index terms (duplicates are kept) */
+export function tokenize(text: string, { kana = true, query = false }: TokenizeOptions = {}): string[] {
+  const terms: string[] = [];
+  for (const [segment] of text.normalize('NFKC').toLowerCase().matchAll(SEGMENT)) {
+    if (LATIN.test(segment)) {
+      if (query || segment.length > 1 || /\d/.test(segment)) terms.push(segment);
+    } else if (HIRAGANA.test(segment)) {
+      if (kana && (query || segment.length > 1)) pushBigrams(segment, terms);
+    } else {
+      pushBigrams(segment, terms);
+    }
+  }
+  return terms;
+}
+
+/** Markdown → plain text good enough for tokenizing (URLs, link targets and HTML tags removed) */
+function markdownToText(markdown: string): string {
+  return markdown
+    .replace(/<[^>]+>/g, ' ')
+    .replace(/!?\[([^\]]*)\]\([^)]*\)/g, '$1')
+    .replace(/https?:\/\/\S+/g, ' ');
+}
+
+export function buildSearchIndex(sources: SearchSource[]): SearchIndex {
+  const postings = new Map<string, number[]>();
+
+  sources.forEach((source, docIndex) => {
+    const weights = new Map<string, number>();
+    const add = (terms: string[], weight: number) => {
+      for (const term of new Set(terms)) weights.set(term, (weights.get(term) ?? 0) + weight);
+    };
+    add(tokenize(source.title), WEIGHT_TITLE);
+    add(tokenize(source.tags.join(' ')), WEIGHT_TAG);
+    add(tokenize(source.description), WEIGHT_DESCRIPTION);
+
+    const bodyCounts = new Map<string, number>();
+    for (const term of tokenize(markdownToText(source.body), { kana: false })) {
+      bodyCounts.set(term, (bodyCounts.get(term) ?? 0) + 1);
+    }
+    bodyCounts.forEach((count, term) => {
+      weights.set(term, (weights.get(term) ?? 0) + Math.min(count, MAX_BODY_WEIGHT));
+    });
+
+    weights.forEach((weight, term) => {
+      const list = postings.get(term) ?? [];
+      list.push(docIndex, weight);
+      postings.set(term, list);
+    });
+  });
+
+  const terms: Record<string, number[]> = {};
+  for (const term of [...postings.keys()].sort()) terms[term] = postings.get(term)!;
+
+  return {
+    version: 1,
+    docs: sources.map(({ body: _body, ...doc }) => doc),
+    terms,
+  };
+}
+
+type MatchMode = 'exact' | 'prefix' | 'contains';
+
+/** How a query term is matched against index terms */
+function matchMode(term: string, lastWord: string | undefined): MatchMode {
+  if (term === lastWord) return 'prefix';
+  // single letters are not indexed, so they can only ever match as a prefix (`c` → `c++`, `css`)
+  if (LATIN.test(term) && term.length === 1) return 'prefix';
+  // kana / kanji are indexed as bigrams, so one character alone would never match exactly
+  if (!LATIN.test(term) && [...term].length === 1) return 'contains';
+  return 'exact';
+}
+
+/** Postings for a query term (a doc matching several index terms keeps its best weight) */
+function lookup(index: SearchIndex, term: string, mode: MatchMode): Map<number, number> | null {
+  const scores = new Map<number, number>();
+  const collect = (list: number[]) => {
+    for (let i = 0; i < list.length; i += 2) {
+      scores.set(list[i], Math.max(scores.get(list[i]) ?? 0, list[i + 1]));
+    }
+  };
+  if (mode === 'prefix') {
+    for (const key in index.terms) {
+      if (key.startsWith(term)) collect(index.terms[key]);
+    }
+  } else if (mode === 'contains') {
+    for (const key in index.terms) {
+      if (key.includes(term)) collect(index.terms[key]);
+    }
+  } else if (index.terms[term]) {
+    collect(index.terms[term]);
+  }
+  return scores.size > 0 ? scores : null;
+}
+
+/** Distinct terms a query is searched with (empty when it contains nothing searchable) */
+export function queryTerms(query: string): string[] {
+  return [...new Set(tokenize(query, { query: true }))];
+}
+
+/**
+ * All query terms must match (hiragana terms that appear nowhere are ignored). Newest first on ties.
+ * The last Latin word matches as a prefix; a single kana / kanji matches any term containing it.
+ */
+export function searchIndex(index: SearchIndex, query: string): SearchDoc[] {
+  const terms = queryTerms(query);
+  if (terms.length === 0) return [];
+
+  const lastWord = query.normalize('NFKC').toLowerCase().trim().match(/[a-z0-9]+(?:\+\+|#)?$/)?.[0];
+  let total: Map<number, number> | null = null;
+
+  for (const term of terms) {
+    const scores = lookup(index, term, matchMode(term, lastWord));
+    if (!scores) {
+      if (HIRAGANA.test(term)) continue;
+      return [];
+    }
+    if (!total) {
+      total = scores;
+      continue;
+    }
+    const next = new Map<number, number>();
+    total.forEach((score, doc) => {
+      const add = scores.get(doc);
+      if (add !== undefined) next.set(doc, score + add);
+    });
+    total = next;
+    if (total.size === 0) return [];
+  }
+
+  if (!total) return [];
+  // docs are stored newest first, so the index doubles as the tie-breaker
+  return [...total.entries()]
+    .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    .map(([doc]) => index.docs[doc]);
+}
@@ -0,0 +1,22 @@
+import type { APIRoute } from 'astro';
+import { formatDate, getPublishedPosts } from '../../lib/blog';
+import { buildSearchIndex } from '../../lib/blogSearch';
+
+// ビルド時に生成する検索インデックス（BlogList の検索欄が初回操作時に読み込む）
+export const GET: APIRoute = async () => {
+  const posts = await getPublishedPosts();
+  const index = buildSearchIndex(posts.map((post) => ({
+    slug: post.slug,
+    title: post.data.title,
+    description: post.data.description,
+    category: post.data.category,
+    date: formatDate(post.data.pubDate),
+    datetime: post.data.pubDate.toISOString(),
+    tags: post.data.tags,
+    body: post.body,
+  })));
+
+  return new Response(JSON.stringify(index), {
+    headers: { 'Content-Type': 'application/json; charset=utf-8' },
+  });
+};